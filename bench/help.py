@@ -0,0 +1,79 @@
+"""
+CPU time per help command, building the embeds versus the shared templates.
+
+Loads every cog, then times what each help command does before its REST
+call: the embeds either built for every call like before the templates,
+or taken from the template registry, and serialized like send does.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/help.py [--calls 20000]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# A handler already in place stops main from opening a log file
+logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+
+import main as bot_main  # noqa: E402
+from src.cogs import bot as bot_cog, fun, maze, wordle  # noqa: E402
+from src.cogs import help as help_cog  # noqa: E402
+from src.utils.embed_templates import templates  # noqa: E402
+
+
+def serialize(embeds):
+    return [embed.to_dict() for embed in (embeds if isinstance(embeds, list) else [embeds])]
+
+
+def timed(call, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def run(calls):
+    bot = bot_main.bot
+    await bot.load_cogs()
+    cog = bot.get_cog("HelpCog")
+    listed = help_cog.help_entries(bot)["fun"]  # Stands in for the old static HELP_DATA
+    page = cog.category_template("fun")
+
+    cases = {
+        "!help menu and page": (
+            lambda: serialize([help_cog.menu_embed(), help_cog.category_embed("fun", listed)]),
+            lambda: serialize([templates.get("help menu"), templates.get(page)]),
+        ),
+        "bot help": (lambda: serialize(bot_cog.help_one()), lambda: serialize(templates.get("bot help"))),
+        "maze help": (lambda: serialize(maze.help_embed()), lambda: serialize(templates.get("maze help"))),
+        "wordle help": (lambda: serialize(wordle.help_embed()), lambda: serialize(templates.get("wordle help"))),
+        "sudo help": (lambda: serialize(fun.help_embed()), lambda: serialize(templates.get("sudo help"))),
+    }
+
+    print(f"{'':>19} {'built us':>9} {'template us':>12} {'built /s':>10} {'template /s':>12}")
+    for name, (build, template) in cases.items():
+        built = timed(build, calls)
+        shared = timed(template, calls)
+        print(f"{name:>19} {built:>9.1f} {shared:>12.1f} {1e6 / built:>10,.0f} {1e6 / shared:>12,.0f}")
+
+    for name in list(bot.extensions):
+        await bot.unload_extension(name)
+    await bot.http_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Member cache memory and gateway work per intents profile.
+
+Builds the intents and member cache of every profile in src/config/intents.py
+for the bot's cogs, then feeds discord.py's connection state synthetic
+GUILD_CREATE and PRESENCE_UPDATE events the way the gateway would send them
+with those intents: members and presences of online members only with the
+presences intent, every member when guilds are chunked, and presence updates
+only with the presences intent. Reports the memory held by the cache
+(tracemalloc) and the events and time spent on them.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/intents_memory.py [--guilds 20] [--members 2000] [--online 0.2] [--updates 5]
+"""
+import gc
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# A handler already in place stops main from opening a log file
+logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+
+import discord  # noqa: E402
+
+from main import cog_names  # noqa: E402
+from src.config import intents as intents_profile  # noqa: E402
+
+JOINED_AT = "2024-01-01T00:00:00+00:00"
+
+
+def member(user_id):
+    return {
+        "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None},
+        "roles": [], "joined_at": JOINED_AT, "deaf": False, "mute": False, "flags": 0
+    }
+
+
+def presence(guild_id, user_id):
+    return {
+        "user": {"id": str(user_id)}, "guild_id": str(guild_id), "status": random.choice(("online", "idle", "dnd")),
+        "activities": [{"name": random.choice(("a game", "music", "code")), "type": 0}],
+        "client_status": {"desktop": "online"}
+    }
+
+
+def guild_create(guild_id, members, online, intents, chunk):
+    """The GUILD_CREATE payload the gateway sends with these intents, chunking folded in."""
+    first = guild_id * 100000
+    data = {
+        "id": str(guild_id), "name": f"guild {guild_id}", "owner_id": str(first), "roles": [], "emojis": [],
+        "stickers": [], "channels": [], "features": [], "member_count": members, "large": members > 250
+    }
+    if chunk:
+        data["members"] = [member(first + i) for i in range(members)]
+    elif intents.presences:
+        data["members"] = [member(first + i) for i in range(online)]
+    if intents.presences:
+        data["presences"] = [presence(guild_id, first + i) for i in range(online)]
+    return data
+
+
+def run_profile(name, guilds, members, online_share, updates):
+    intents, member_cache_flags, chunk = intents_profile.build(cog_names(), name)
+    online = int(members * online_share)
+    # Payloads are built before measuring, only what the cache keeps is counted
+    payloads = [guild_create(guild_id, members, online, intents, chunk) for guild_id in range(1, guilds + 1)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    client = discord.Client(intents=intents, member_cache_flags=member_cache_flags, chunk_guilds_at_startup=False)
+    state = client._connection
+    for data in payloads:
+        state._get_create_guild(data)
+    del payloads
+
+    events = guilds
+    start = time.perf_counter()
+    if intents.presences:
+        for _ in range(guilds * online * updates):
+            guild_id = random.randrange(1, guilds + 1)
+            state.parse_presence_update(presence(guild_id, guild_id * 100000 + random.randrange(online)))
+            events += 1
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    cached = sum(len(guild.members) for guild in client.guilds)
+    print(f"{name:>9} {cached:>9,} {held / 2**20:>9.2f} {events:>9,} {elapsed:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--online", type=float, default=0.2, help="share of members online")
+    parser.add_argument("--updates", type=int, default=5, help="presence updates per online member")
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{args.guilds} guilds of {args.members} members, {args.online:.0%} online, default profile: {intents_profile.INTENTS_PROFILE}")
+    print(f"{'profile':>9} {'members':>9} {'cache MB':>9} {'events':>9} {'events s':>9}")
+    for name in intents_profile.PROFILES:
+        run_profile(name, args.guilds, args.members, args.online, args.updates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Stress test for the per-player game locks.
+
+Fires thousands of concurrent simulated button clicks at maze games of a few
+players and checks that no move was lost: every click answered with a board
+must be counted in the saved game and the player must stand where the
+answered moves put them.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/maze_clicks.py [--users 50] [--clicks 5000] [--shared]
+
+--shared reads every game through the database like cluster mode does,
+clicks racing each other there are redone after a version conflict.
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# A handler already in place stops main from opening a log file
+logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+
+from src.utils import game_store  # noqa: E402
+from src.cogs import maze  # noqa: E402
+
+CORRIDOR = 15  # Cells the player can walk along, left and right only
+
+
+def corridor_maze():
+    """One open row, so every left/right click either moves or hits the end wall."""
+    board = maze.Maze(CORRIDOR + 2, 5)
+    for c in range(1, CORRIDOR + 1):
+        board.set_path(2, c)
+    board.player = (2, 1)
+    board.goal = (0, 0)  # In the wall, never reached
+    return board
+
+
+class FakeInteraction:
+    """What MazeView touches of an interaction, every answer yields to other clicks first."""
+
+    def __init__(self, user_id):
+        self.user = SimpleNamespace(id=int(user_id))
+        self.response = SimpleNamespace(send_message=self.send_message)
+        self.moved = False
+
+    async def send(self, **kwargs):
+        # Answered with a board, the click moved the player
+        await asyncio.sleep(0)
+        self.moved = True
+
+    async def send_message(self, content, **kwargs):
+        # Answered with an error, e.g. the end of the corridor
+        await asyncio.sleep(0)
+
+
+async def run(users, clicks, shared):
+    maze.USE_IMAGE_RENDER = False  # Only the game state is under test
+    cog = maze.MazeGame(SimpleNamespace())
+    cog.games.shared = shared
+    cog.games.flush_delay = 0 if shared else cog.games.flush_delay
+    await cog.cog_load()
+
+    answers = {}
+    views = {}
+    for user in range(users):
+        user_id = str(user)
+        cog.games.put(user_id, {"maze": corridor_maze(), "level": 1, "moves": 0, "width": CORRIDOR + 2, "height": 5})
+        answers[user_id] = {"moved": 0, "right": 0, "left": 0}
+        views[user_id] = maze.MazeView(cog, user_id)
+    await cog.games.flush()
+
+    async def click(user_id):
+        direction = random.choice(("left", "right"))
+        interaction = FakeInteraction(user_id)
+        await views[user_id].on_button_click(interaction, direction)
+        if interaction.moved:
+            answers[user_id]["moved"] += 1
+            answers[user_id][direction] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(click(str(random.randrange(users))) for _ in range(clicks)))
+    elapsed = time.perf_counter() - start
+
+    lost = 0
+    for user_id, answer in answers.items():
+        game = await cog.games.get(user_id)
+        expected_col = 1 + answer["right"] - answer["left"]
+        if game["moves"] != answer["moved"] or game["maze"].player != (2, expected_col):
+            lost += 1
+    await cog.cog_unload()
+
+    print(f"{clicks} clicks over {users} players in {elapsed:.2f}s ({clicks / elapsed:.0f} clicks/s)")
+    print(f"store: {'shared' if shared else 'local'}")
+    print(f"players with lost moves: {lost}/{users}")
+    return lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--clicks", type=int, default=5000)
+    parser.add_argument("--shared", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Games go to a throwaway database, never the bot's own
+        game_store.DATABASE_FILE = os.path.join(tmp, "games.db")
+        lost = asyncio.run(run(args.users, args.clicks, args.shared))
+    sys.exit(1 if lost else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cost of one maze move by board size.
+
+Compares scanning a list-of-rows board for the player (how moves worked
+before positions were stored) with a click on the real MazeView: its lock taken,
+the game read from the store, the move applied and the game saved. Rendering is
+left out, bench/maze_render.py measures it. The write column is one write-behind
+flush of the game. Both game columns should cost the same at every level.
+Other players' games fill the store's cache first, like on a busy bot.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/maze_moves.py [--moves 20000] [--games 1000]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# A handler already in place stops main from opening a log file
+logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+
+from settings import MAZE_WIDTH  # noqa: E402
+from src.utils import game_store  # noqa: E402
+from src.cogs import maze  # noqa: E402
+
+STEPS = {"right": (0, 1), "left": (0, -1), "down": (1, 0), "up": (-1, 0)}
+OPPOSITE = {"right": "left", "left": "right", "down": "up", "up": "down"}
+
+
+def scan_move(rows, step):
+    """Find the player by scanning every cell, then move like the old grid did."""
+    for r, row in enumerate(rows):
+        if maze.PLAYER in row:
+            c = row.index(maze.PLAYER)
+            break
+    nr, nc = r + step[0], c + step[1]
+    if rows[nr][nc] != maze.WALL:
+        rows[r][c], rows[nr][nc] = maze.PATH, maze.PLAYER
+
+
+async def skip_render(*args, **kwargs):
+    pass
+
+
+def open_direction(board):
+    """A direction the player can step in from the start, and back."""
+    r, c = board.player
+    for name, (dr, dc) in STEPS.items():
+        if not board.is_wall(r + dr, c + dc):
+            return name
+
+
+async def game_moves(cog, level, size, moves):
+    board = maze.create_maze(size, size, seed=level)
+    user_id = str(level)
+    view = maze.MazeView(cog, user_id)
+    interaction = SimpleNamespace(user=SimpleNamespace(id=level))
+    cog.games.put(user_id, {"maze": board, "level": level, "moves": 0, "width": size, "height": size})
+    await cog.games.flush()
+
+    there = open_direction(board)
+    buttons = (there, OPPOSITE[there])
+    start = time.perf_counter()
+    for i in range(moves):
+        await view.on_button_click(interaction, buttons[i & 1])
+    per_move = (time.perf_counter() - start) / moves * 1e6
+
+    start = time.perf_counter()
+    await cog.games.flush()
+    write = (time.perf_counter() - start) * 1e6
+
+    game = await cog.games.get(user_id)
+    assert game["moves"] == moves, "a move was lost"
+    return per_move, write
+
+
+async def run(moves, games):
+    maze.send_board = skip_render
+    cog = maze.MazeGame(SimpleNamespace())
+    await cog.cog_load()
+    for user in range(games):
+        board = maze.create_maze(MAZE_WIDTH, MAZE_WIDTH, seed=user)
+        cog.games.put(f"other {user}", {"maze": board, "level": 1, "moves": 0, "width": MAZE_WIDTH, "height": MAZE_WIDTH})
+    await cog.games.flush()
+
+    print(f"{'level':>5} {'size':>9} {'scan us':>9} {'game us':>9} {'write us':>9}")
+    for level in (1, 5, 10, 20, 40):
+        size = MAZE_WIDTH + 2 * (level - 1)
+        rows = maze.create_maze(size, size, seed=level).to_rows()
+        start = time.perf_counter()
+        for i in range(moves):
+            scan_move(rows, STEPS[("right", "left", "down", "up")[i & 3]])
+        scan = (time.perf_counter() - start) / moves * 1e6
+
+        per_move, write = await game_moves(cog, level, size, moves)
+        print(f"{level:>5} {f'{size}x{size}':>9} {scan:>9.2f} {per_move:>9.2f} {write:>9.0f}")
+    await cog.cog_unload()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--moves", type=int, default=20000)
+    parser.add_argument("--games", type=int, default=game_store.CACHE_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Games go to a throwaway database, never the bot's own
+        game_store.DATABASE_FILE = os.path.join(tmp, "games.db")
+        asyncio.run(run(args.moves, args.games))
+
+
+if __name__ == "__main__":
+    main()
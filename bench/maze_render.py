@@ -0,0 +1,104 @@
+"""
+Maze board render time by board size.
+
+Compares the old renderer (one ImageDraw rectangle per cell, glyphs measured
+per cell, font loaded per call) with the tile renderer: drawing alone, the
+full render with its PNG encode, and a move on a cached board.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/maze_render.py [--runs 5]
+"""
+import io
+import os
+import sys
+import time
+import logging
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# A handler already in place stops main from opening a log file
+logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from src.cogs import maze  # noqa: E402
+from src.cogs.maze import CELL_SIZE, COLORS, FONT_PATH, FONT_SIZE, PLAYER, WALL, PATH  # noqa: E402
+
+
+def old_draw(rows):
+    """The renderer before the tile atlas, kept here as the baseline."""
+    img = Image.new("RGB", (len(rows[0]) * CELL_SIZE, len(rows) * CELL_SIZE), COLORS["path"])
+    draw = ImageDraw.Draw(img)
+    try:
+        font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+    except Exception:
+        font = ImageFont.load_default()
+
+    for y, row in enumerate(rows):
+        for x, cell in enumerate(row):
+            px, py = x * CELL_SIZE, y * CELL_SIZE
+            rect = [px, py, px + CELL_SIZE, py + CELL_SIZE]
+            if cell == WALL:
+                draw.rectangle(rect, fill=COLORS["wall"])
+            elif cell == PATH:
+                draw.rectangle(rect, fill=COLORS["path"])
+            else:
+                draw.rectangle(rect, fill=COLORS["path"])
+                bbox = draw.textbbox((0, 0), cell, font=font)
+                w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+                color = COLORS["player"] if cell == PLAYER else COLORS["goal"]
+                draw.text((px + (CELL_SIZE - w) / 2, py + (CELL_SIZE - h) / 2), cell, fill=color, font=font)
+            draw.rectangle(rect, outline=COLORS["grid"], width=1)
+    return img
+
+
+def old_render(rows):
+    buffer = io.BytesIO()
+    old_draw(rows).save(buffer, format="PNG")
+    return buffer
+
+
+def best_of(runs, render):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        render()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    maze.tile_atlas(CELL_SIZE)  # Built once per process, not part of a render
+    print(f"{'':>9} {'draw only':^25} {'draw + PNG':^25} {'cached':>8}")
+    print(f"{'size':>9} {'old ms':>8} {'tiles ms':>8} {'speedup':>7} {'old ms':>8} {'tiles ms':>8} {'speedup':>7} {'ms':>8}")
+    for size in (11, 25, 51, 101):
+        board = maze.create_maze(size, size, seed=size)
+        old_drawn = best_of(args.runs, lambda: old_draw(board.to_rows()))
+        new_drawn = best_of(args.runs, lambda: maze.draw_board(board, 0, size, 0, size))
+        old = best_of(args.runs, lambda: old_render(board.to_rows()))
+        new = best_of(args.runs, lambda: maze.render_board_image(board, 1, 0))
+
+        # A move on a board already in the cache only repaints two cells
+        maze.render_board_image(board, 1, 0, None, "bench")
+        r, c = board.player
+        steps = [(r + dr, c + dc) for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)) if not board.is_wall(r + dr, c + dc)]
+
+        def move():
+            board.player = steps[0] if board.player == (r, c) else (r, c)
+            maze.render_board_image(board, 1, 0, None, "bench")
+
+        cached = best_of(args.runs, move)
+        maze.evict_board("bench")
+        print(f"{f'{size}x{size}':>9} {old_drawn:>8.1f} {new_drawn:>8.1f} {old_drawn / new_drawn:>6.1f}x "
+              f"{old:>8.1f} {new:>8.1f} {old / new:>6.1f}x {cached:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
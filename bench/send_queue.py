@@ -0,0 +1,148 @@
+"""
+Rate limits hit by concurrent sudo dance animations.
+
+Runs dances on a few channels against a mock REST API that enforces
+Discord's per-channel bucket (5 requests per window) and answers 429 when it
+is full. Compares editing the message directly, like the animations did
+before, with going through the send queue. Time is scaled down 10x, a 5s
+window takes 0.5s here.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/send_queue.py [--dances 12] [--channels 4]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+import argparse
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# A handler already in place stops main from opening a log file
+logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+
+import discord  # noqa: E402
+
+from src.utils import send_queue  # noqa: E402
+
+SCALE = 0.1  # Every delay and window is this share of the real one
+FINAL = "Dance party over!"
+
+
+class MockREST:
+    """Per-channel fixed window buckets, the window starts with its first request like Discord's."""
+
+    def __init__(self, rate=send_queue.ROUTE_RATE, per=send_queue.ROUTE_PER * SCALE):
+        self.rate = rate
+        self.per = per
+        self.windows = {}  # channel id -> [window end, requests left]
+        self.ok = 0
+        self.limited = 0
+
+    async def request(self, channel_id):
+        await asyncio.sleep(0.002)  # Round trip
+        now = time.monotonic()
+        window = self.windows.get(channel_id)
+        if window is None or now >= window[0]:
+            window = self.windows[channel_id] = [now + self.per, self.rate]
+        if not window[1]:
+            self.limited += 1
+            raise discord.HTTPException(SimpleNamespace(status=429, reason="Too Many Requests"), "rate limited")
+        window[1] -= 1
+        self.ok += 1
+
+
+class MockMessage:
+    def __init__(self, rest, channel, message_id, content):
+        self.rest = rest
+        self.channel = channel
+        self.id = message_id
+        self.content = content
+
+    async def edit(self, content):
+        await self.rest.request(self.channel.id)
+        self.content = content
+        return self
+
+
+class MockChannel:
+    def __init__(self, rest, channel_id):
+        self.rest = rest
+        self.id = channel_id
+        self.ids = iter(range(channel_id * 1000, channel_id * 1000 + 1000))
+
+    async def send(self, content):
+        # ctx.send isn't queued, discord.py waits out a 429 on it and tries again
+        while True:
+            try:
+                await self.rest.request(self.id)
+            except discord.HTTPException:
+                await asyncio.sleep(self.rest.windows[self.id][0] - time.monotonic())
+            else:
+                return MockMessage(self.rest, self, next(self.ids), content)
+
+
+async def dance(channel, queue):
+    """sudo dance with its sleeps scaled down, frames either edited directly or queued."""
+    await asyncio.sleep(random.uniform(0, 0.05))
+    msg = await channel.send("Running `sudo dance`...")
+    await asyncio.sleep(0.5 * SCALE)
+
+    for _ in range(random.randint(5, 12)):
+        content = f"The bot dances: {'*' * random.randint(3, 7)}"
+        if queue is None:
+            try:
+                await msg.edit(content=content)
+            except discord.HTTPException:
+                pass
+        else:
+            queue.edit(msg, content=content)
+        await asyncio.sleep(random.uniform(0.3, 1.0) * SCALE)
+
+    try:
+        if queue is None:
+            await msg.edit(content=FINAL)
+        else:
+            await queue.edit(msg, priority=send_queue.NORMAL, content=FINAL)
+    except discord.HTTPException:
+        pass
+    return msg
+
+
+async def run(dances, channels, queued):
+    random.seed(dances)
+    rest = MockREST()
+    targets = [MockChannel(rest, channel_id) for channel_id in range(1, channels + 1)]
+    queue = send_queue.SendQueue(route_per=send_queue.ROUTE_PER * SCALE) if queued else None
+
+    start = time.perf_counter()
+    messages = await asyncio.gather(*(dance(targets[i % channels], queue) for i in range(dances)))
+    elapsed = time.perf_counter() - start
+    shown = sum(msg.content == FINAL for msg in messages)
+
+    line = f"{'queued' if queued else 'direct'}: {rest.ok:>3} ok, {rest.limited:>3} x 429, {shown:>2}/{dances} final frames shown"
+    if queue is not None:
+        line += f", {queue.stats['coalesced']} frames coalesced"
+        queue.close()
+    print(f"{line}, {elapsed / SCALE:.1f}s unscaled")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dances", type=int, default=12)
+    parser.add_argument("--channels", type=int, default=4)
+    args = parser.parse_args()
+
+    send_queue.WINDOW_MARGIN *= SCALE
+    print(f"{args.dances} concurrent dances on {args.channels} channels")
+    asyncio.run(run(args.dances, args.channels, queued=False))
+    asyncio.run(run(args.dances, args.channels, queued=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold start time until every cog is loaded.
+
+Each run is a fresh Python process that imports main and loads the cogs the
+way setup_hook does, so module imports are part of the time. Compares
+load_cogs, which gathers every load_extension, with loading the cogs one
+after the other like on_ready used to, and with that plus Pillow imported
+up front like the maze and wordle modules used to.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/startup.py [--runs 15]
+"""
+import os
+import sys
+import time
+import asyncio
+import importlib
+import logging
+import argparse
+import statistics
+import subprocess
+
+START = time.perf_counter()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+
+async def load(mode):
+    """Load every cog in this process, return (cog loading, start to cogs ready) in ms."""
+    # A handler already in place stops main from opening a log file for every run
+    logging.getLogger("discord.bot").addHandler(logging.NullHandler())
+    import main
+
+    bot = main.bot
+    start = time.perf_counter()
+    if mode == "gather":
+        await bot.load_cogs()
+    else:
+        if mode == "old":
+            # The maze and wordle modules imported Pillow when they loaded
+            for module in ("PIL.Image", "PIL.ImageDraw", "PIL.ImageFont"):
+                importlib.import_module(module)
+        for name in main.cog_names():
+            await bot.load_cog(name)
+    ready = time.perf_counter()
+
+    for name in list(bot.extensions):
+        await bot.unload_extension(name)
+    await bot.http_client.close()
+    return (ready - start) * 1000, (ready - START) * 1000
+
+
+def measure(mode, runs):
+    loading, cold = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, __file__, "--child", mode], capture_output=True, text=True, check=True)
+        cog_ms, cold_ms = map(float, out.stdout.split())
+        loading.append(cog_ms)
+        cold.append(cold_ms)
+    return statistics.median(loading), statistics.median(cold)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--child", choices=("old", "sequential", "gather"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(*asyncio.run(load(args.child)))
+        return
+
+    print(f"median of {args.runs} runs")
+    for mode in ("old", "sequential", "gather"):
+        loading, cold = measure(mode, args.runs)
+        print(f"{mode:>10}: cog loading {loading:6.1f}ms, cold start to cogs ready {cold:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Messages per second through the wordle on_message listener.
+
+Feeds the listener traffic like a big server's, where almost no message
+comes from a player with a game in that channel. Compares the listener with
+the old one, which checked the prefix and lowercased the content before
+looking at the author.
+
+Run from the repo root, with the bot's settings.py in place:
+    python bench/wordle_listener.py [--messages 200000] [--players 100]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.cogs import wordle  # noqa: E402
+
+CHANNELS = 1000
+USERS = 100000
+
+
+class OldListener:
+    """The listener before channel routing, up to the point where a non-player is turned away."""
+
+    def __init__(self, active_games):
+        self.active_games = active_games
+
+    async def on_message(self, message):
+        if message.author.bot or not message.content.startswith("!"):
+            return
+        message.content[1:].lower()
+        if message.author.id not in self.active_games:
+            return
+
+
+def traffic(count, players):
+    """Random chat plus a share of prefixed commands, none of it from players in their game channel."""
+    messages = []
+    for _ in range(count):
+        content = random.choice(("!help", "!meme 3", "hello there", "gg", "lol what", "!PLAYS"))
+        author = SimpleNamespace(id=random.randrange(players, USERS), bot=random.random() < 0.05)
+        messages.append(SimpleNamespace(author=author, channel=SimpleNamespace(id=random.randrange(CHANNELS)), content=content))
+    return messages
+
+
+async def rate(listener, messages, runs=3):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        for message in messages:
+            await listener(message)
+        best = min(best, time.perf_counter() - start)
+    return len(messages) / best
+
+
+async def run(count, players):
+    cog = wordle.Wordle(SimpleNamespace())
+    active_games = {}
+    for user_id in range(players):
+        cog.route(user_id, random.randrange(CHANNELS))
+        active_games[user_id] = {}
+
+    messages = traffic(count, players)
+    old = await rate(OldListener(active_games).on_message, messages)
+    new = await rate(cog.on_message, messages)
+    print(f"{count} messages, {players} players with a game")
+    print(f"old listener: {old:,.0f} messages/s")
+    print(f"new listener: {new:,.0f} messages/s ({new / old:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--players", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.players))
+
+
+if __name__ == "__main__":
+    main()
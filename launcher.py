@@ -0,0 +1,91 @@
+import os
+import sys
+import asyncio
+import secrets
+
+import aiohttp
+
+from src.config.bootstrap import logger, TOKEN
+from src.config.cluster import CLUSTERS, TOTAL_SHARDS, IPC_HOST, IPC_PORT
+from src.utils.ipc import IpcServer
+
+# ================= CONFIG =================
+RESTART_DELAY = 5             # Seconds before a crashed cluster is started again
+# ==========================================
+
+
+async def recommended_shards(token):
+    async with aiohttp.ClientSession() as session:
+        async with session.get("https://discord.com/api/v10/gateway/bot", headers={"Authorization": f"Bot {token}"}) as r:
+            r.raise_for_status()
+            return (await r.json())["shards"]
+
+
+def shard_ranges(shard_count, clusters):
+    """Split shard ids 0..shard_count-1 into at most clusters contiguous ranges of near equal size."""
+    clusters = max(1, min(clusters, shard_count))
+    per_cluster, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for cluster in range(clusters):
+        end = start + per_cluster + (cluster < extra)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+class Launcher:
+    """
+    Runs the bot as several worker processes (main.py in cluster mode), each
+    with its own range of shards. Workers talk to each other through the
+    launcher's IPC server, e.g. `bot ping` asks every cluster for its shard
+    latencies and `bot quit` shuts every cluster down.
+    """
+
+    def __init__(self, token):
+        self.token = token
+        self.secret = secrets.token_hex(16)
+        self.quitting = False
+        self.ipc = IpcServer(self.secret, {"quit": self.quit})
+
+    async def run(self):
+        shard_count = TOTAL_SHARDS or await recommended_shards(self.token)
+        ranges = shard_ranges(shard_count, CLUSTERS)
+        logger.info(f"Starting {len(ranges)} clusters for {shard_count} shards")
+
+        await self.ipc.start(IPC_HOST, IPC_PORT)
+        try:
+            await asyncio.gather(*(
+                self.keep_running(cluster, shards, shard_count) for cluster, shards in enumerate(ranges)
+            ))
+        finally:
+            await self.ipc.close()
+
+    async def keep_running(self, cluster, shards, shard_count):
+        env = {
+            **os.environ,
+            "NEXUS_CLUSTER_ID": str(cluster),
+            "NEXUS_SHARD_IDS": ",".join(map(str, shards)),
+            "NEXUS_SHARD_COUNT": str(shard_count),
+            "NEXUS_IPC_SECRET": self.secret
+        }
+        while not self.quitting:
+            logger.info(f"Starting cluster {cluster} with shards {shards[0]}-{shards[-1]}")
+            process = await asyncio.create_subprocess_exec(sys.executable, "main.py", env=env)
+            code = await process.wait()
+            if self.quitting:
+                break
+            logger.warning(f"Cluster {cluster} exited with code {code}, restarting in {RESTART_DELAY}s")
+            await asyncio.sleep(RESTART_DELAY)
+        logger.info(f"Cluster {cluster} stopped")
+
+    async def quit(self):
+        """Asked for by `bot quit` on any cluster, every cluster closes and none is restarted."""
+        self.quitting = True
+        return await self.ipc.broadcast("quit")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(Launcher(TOKEN).run())
+    except KeyboardInterrupt:
+        pass
@@ -1,82 +1,101 @@
-import discord
 from discord.ext import commands
 import os
-import logging
-from colorama import Fore, Style, init
-from datetime import datetime
-from dotenv import load_dotenv
+import time
+import asyncio
 from settings import PREFIX
-
-# Initialize colorama
-init(autoreset=True)
-
-# Discord-style console formatter with bold timestamp and level
-class DiscordStyledFormatter(logging.Formatter):
-    LEVEL_COLORS = {
-        "DEBUG": Fore.CYAN + Style.BRIGHT,
-        "INFO": Fore.BLUE + Style.BRIGHT,
-        "WARNING": Fore.YELLOW + Style.BRIGHT,
-        "ERROR": Fore.RED + Style.BRIGHT,
-        "CRITICAL": Fore.RED + Style.BRIGHT,
-    }
-    LOGGER_COLOR = Fore.MAGENTA
-    TIME_COLOR = Fore.LIGHTBLACK_EX + Style.BRIGHT
-    MESSAGE_COLOR = Fore.WHITE
-
-    def format(self, record):
-        time_str = f"{self.TIME_COLOR}{self.formatTime(record, '%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}"
-        level_str = f"{self.LEVEL_COLORS.get(record.levelname,'')}{record.levelname:<8}{Style.RESET_ALL}"
-        logger_name = f"{self.LOGGER_COLOR}{record.name}{Style.RESET_ALL}"
-        message = f"{self.MESSAGE_COLOR}{record.getMessage()}{Style.RESET_ALL}"
-        return f"{time_str} {level_str} {logger_name} {message}"
-
-# Create discord.bot logger
-logger = logging.getLogger("discord.bot")
-logger.setLevel(logging.INFO)
-logger.propagate = False
-
-if not logger.handlers:
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(DiscordStyledFormatter())
-    logger.addHandler(console_handler)
-
-    # File handler with new log each time
-    now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_dir = "src/logs"
-    os.makedirs(log_dir, exist_ok=True)  # Ensure folder exists
-    log_file = os.path.join(log_dir, f"BOT_{now}.log")
-
-    file_handler = logging.FileHandler(log_file, encoding="utf-8", mode="w")
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s %(levelname)-8s %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
-    logger.addHandler(file_handler)
+from src.config import cluster
+from src.config.bootstrap import logger, TOKEN
+from src.config import intents as intents_profile
+from src.utils.http import HttpClient
+from src.utils.ipc import connect as connect_ipc
+from src.utils.send_queue import SendQueue
 
 # Bot setup
-bot = commands.Bot(command_prefix=PREFIX, intents=discord.Intents.all(), help_command=None)
+def cog_names():
+    return sorted(f[:-3] for f in os.listdir("./src/cogs") if f.endswith(".py"))
+
+# Cluster workers started by launcher.py run a range of shards each
+BotBase = commands.AutoShardedBot if cluster.AUTO_SHARD or cluster.CLUSTERED else commands.Bot
+
+class NexusBot(BotBase):
+    """The bot plus services shared by every cog."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http_client = HttpClient()
+        self.send_queue = SendQueue()
+        self.ipc = None  # Connection to launcher.py in cluster mode
+
+    async def setup_hook(self):
+        # Runs once before connecting, on_ready fires again after every reconnect
+        if cluster.CLUSTERED:
+            self.ipc = await connect_ipc(
+                cluster.IPC_HOST, cluster.IPC_PORT, cluster.IPC_SECRET, cluster.CLUSTER_ID,
+                {"ping": self.ipc_ping, "quit": self.ipc_quit}
+            )
+        await self.load_cogs()
+
+    # --- Cluster ---
+    def shard_latencies(self):
+        """Latency in ms of every shard this process runs."""
+        if isinstance(self, commands.AutoShardedBot):
+            return {shard_id: round(latency * 1000) for shard_id, latency in self.latencies}
+        return {0: round(self.latency * 1000)}
+
+    async def ipc_ping(self):
+        return {"shards": self.shard_latencies(), "guilds": len(self.guilds)}
 
-load_dotenv()
-TOKEN = os.getenv("token", 'Please make .env file with toke="YOUR_TOKEN"')
+    async def ipc_quit(self):
+        # Answer the launcher first, the close runs right after
+        self.quit_task = asyncio.create_task(self.close())
+        return {"ok": True}
+
+    async def load_cogs(self):
+        """Load every cog in src/cogs at once and log how long each took."""
+        names = cog_names()
+        start = time.perf_counter()
+        # Cogs don't depend on each other, their cog_load I/O (stores, word lists, prefetching) overlaps
+        results = await asyncio.gather(*(self.load_cog(name) for name in names))
+        total = time.perf_counter() - start
+
+        width = max(len(name) for name in names)
+        table = "\n".join(f"  {name:<{width}}  {status:<6}  {elapsed * 1000:7.1f}ms" for name, status, elapsed in results)
+        logger.info(f"Loaded {sum(status == 'ok' for _, status, _ in results)}/{len(names)} cogs in {total * 1000:.1f}ms\n{table}")
+
+    async def load_cog(self, name):
+        start = time.perf_counter()
+        try:
+            await self.load_extension(f"src.cogs.{name}")
+        except commands.ExtensionError as e:
+            logger.error(f"Failed to load cog: {name} error:\n{e}")
+            status = "failed"
+        else:
+            status = "ok"
+        return name, status, time.perf_counter() - start
+
+    async def close(self):
+        # Cogs are unloaded first, they may still use the client on the way out
+        await super().close()
+        self.send_queue.close()
+        await self.http_client.close()
+        if self.ipc is not None:
+            self.ipc.close()
+
+# Only the gateway events and member cache the cogs actually use, see src/config/intents.py
+intents, member_cache_flags, chunk_guilds = intents_profile.build(cog_names())
+bot = NexusBot(
+    command_prefix=PREFIX,
+    intents=intents,
+    member_cache_flags=member_cache_flags,
+    chunk_guilds_at_startup=chunk_guilds,
+    help_command=None,
+    **({"shard_ids": cluster.SHARD_IDS, "shard_count": cluster.SHARD_COUNT} if cluster.CLUSTERED else {})
+)
 
 @bot.event
 async def on_ready():
+    # Cogs are loaded once in setup_hook, this runs again after every reconnect
     logger.info(f"Logged in as {bot.user}")
-    logger.info("Syncing commands...")
-
-    for filename in os.listdir("./src/cogs"):
-        if filename.endswith(".py"):
-            try:
-                await bot.load_extension(f"src.cogs.{filename[:-3]}")
-            except discord.ext.commands.errors.ExtensionFailed as e:
-                logger.error(f"Failed to load cog: {filename[:-3]} error:\n{e}")
-            else:
-                logger.info(f"Successfully loaded cog: {filename[:-3]}")
-
-    logger.info("Syncing completed!")
 
 ascii_art = """
  ____                                        __                              
@@ -102,8 +121,10 @@ ascii_art = """
 """
 
 if __name__ == "__main__":
-    os.system("clear")
-    print(ascii_art)
+    # Cluster workers share the launcher's terminal
+    if not cluster.CLUSTERED:
+        os.system("clear")
+        print(ascii_art)
     
     try:
         bot.run(TOKEN)
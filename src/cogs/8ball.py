@@ -4,10 +4,12 @@ from discord.ext import commands
 import random
 
 class Ball(commands.Cog):
+    help_category = "fun"
+
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.command(aliases=['8ball'])
+    @commands.command(name="8ball", aliases=['_8ball'], usage="<question>", brief="Ask the magic 8ball a question")
     async def _8ball(self, ctx, *, question):
         responses = [
             'It is certain.', 
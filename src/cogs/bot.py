@@ -1,8 +1,14 @@
 import discord
 from discord.ext import commands
 from settings import QUIT_COMMAND, PREFIX
+from src.config.intents import INTENTS_PROFILE
+from src.utils.embed_templates import templates
+from src.utils.render_pool import render_pool
+from src.utils.ttl_cache import CACHES
 
+import os
 import time
+import resource
 
 def help_one():
     embed = discord.Embed(
@@ -13,6 +19,9 @@ def help_one():
     embed.add_field(name=PREFIX+"bot help", value=f"Shows this message!", inline=False)
     embed.add_field(name=PREFIX+"bot quit", value=f"Turns off bot", inline=False)
     embed.add_field(name=PREFIX+"bot ping", value=f"Get bots latency!", inline=False)
+    embed.add_field(name=PREFIX+"bot renders", value=f"Image render timings!", inline=False)
+    embed.add_field(name=PREFIX+"bot memory", value=f"Intents profile and cache sizes!", inline=False)
+    embed.add_field(name=PREFIX+"bot caches", value=f"Hit rates of API caches!", inline=False)
     #embed.add_field(name=PREFIX+"", value=f"", inline=False)
     #embed.add_field(name=PREFIX+"", value=f"", inline=False)
     #embed.add_field(name=PREFIX+"", value=f"", inline=False)
@@ -35,6 +44,16 @@ def help_one():
     
     return [embed, embed2]
 
+templates.register("bot help", help_one)
+
+def rss_mb():
+    """Resident memory of this process, peak RSS where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
 class OwnerCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -42,7 +61,7 @@ class OwnerCommands(commands.Cog):
     @commands.group(name="bot", invoke_without_command=True, hidden=True)
     @commands.is_owner()
     async def botgroup(self, ctx):
-        await ctx.send(embeds=help_one())
+        await ctx.send(embeds=templates.get("bot help"))
     
     # Creating command quit
     @botgroup.command(name="quit", description="Turns off bot.", hidden=True)
@@ -50,6 +69,11 @@ class OwnerCommands(commands.Cog):
     async def quiting(self, ctx):
         if not QUIT_COMMAND: return
         await ctx.send("Bot is turning off please wait...")
+        if self.bot.ipc is not None:
+            # Cluster mode, the launcher closes every cluster and stops restarting them
+            await self.bot.ipc.request("quit")
+            return
+        # close() unloads every cog, game cogs flush their unsaved games in cog_unload
         await self.bot.close()
     
     @quiting.error
@@ -59,6 +83,22 @@ class OwnerCommands(commands.Cog):
     @botgroup.command(name="ping", hidden=True)
     @commands.is_owner()
     async def botping(self, ctx):
+        if self.bot.ipc is not None:
+            # Cluster mode, every cluster reports the shards it runs
+            clusters = await self.bot.ipc.request("broadcast", call="ping")
+            lines = []
+            for cluster, reply in sorted(clusters.items(), key=lambda item: int(item[0])):
+                if "error" in reply:
+                    lines.append(f"Cluster {cluster}: ❌ {reply['error']}")
+                    continue
+                shards = " | ".join(f"#{shard} {latency}ms" for shard, latency in reply["shards"].items())
+                lines.append(f"Cluster {cluster} ({reply['guilds']} guilds): {shards}")
+            return await ctx.send("Pong!\n" + "\n".join(lines))
+
+        shards = self.bot.shard_latencies()
+        if len(shards) > 1:
+            return await ctx.send("Pong!\n" + "\n".join(f"Shard #{shard}: {latency}ms" for shard, latency in shards.items()))
+
         latency = round(self.bot.latency * 1000)  # Convert to milliseconds and round
         
         await ctx.send(f"Pong! Bot latency: {latency}")
@@ -67,6 +107,47 @@ class OwnerCommands(commands.Cog):
     async def handle_error_quitting(self, ctx, error):
         await ctx.send("❌ You are not owner or some error happened!")
 
+    @botgroup.command(name="renders", hidden=True)
+    @commands.is_owner()
+    async def botrenders(self, ctx):
+        lines = [
+            f"`{name}`: {count} renders | avg {total / count * 1000:.1f}ms | max {slowest * 1000:.1f}ms"
+            for name, (count, total, slowest) in render_pool.stats.items()
+        ]
+        await ctx.send("\n".join(lines) or "No renders yet.")
+
+    @botgroup.command(name="memory", hidden=True)
+    @commands.is_owner()
+    async def botmemory(self, ctx):
+        bot = self.bot
+        enabled = [name for name, value in bot.intents if value]
+        cache_flags = [name for name, value in bot._connection.member_cache_flags if value]
+
+        embed = discord.Embed(title="🧠 Memory", description=f"Intents profile: `{INTENTS_PROFILE}`")
+        embed.add_field(name="Intents", value=", ".join(enabled) or "None", inline=False)
+        embed.add_field(name="Member cache", value=", ".join(cache_flags) or "None", inline=False)
+        embed.add_field(name="Chunk guilds at startup", value=bot._connection._chunk_guilds, inline=False)
+        embed.add_field(name="Guilds", value=len(bot.guilds))
+        embed.add_field(name="Cached members", value=sum(len(guild.members) for guild in bot.guilds))
+        embed.add_field(name="Cached users", value=len(bot.users))
+        embed.add_field(name="Cached messages", value=len(bot.cached_messages))
+        embed.add_field(name="RSS", value=f"{rss_mb():.1f} MB")
+        await ctx.send(embed=embed)
+
+    @botgroup.command(name="caches", hidden=True)
+    @commands.is_owner()
+    async def botcaches(self, ctx):
+        lines = []
+        for name, cache in CACHES.items():
+            stats = cache.stats
+            lookups = stats["hits"] + stats["negative_hits"] + stats["misses"] + stats["shared"]
+            hit_rate = (stats["hits"] + stats["negative_hits"] + stats["shared"]) / lookups * 100 if lookups else 0
+            lines.append(
+                f"`{name}`: {len(cache.entries)}/{cache.max_size} cached | {hit_rate:.0f}% served without a fetch | "
+                + " | ".join(f"{key} {value}" for key, value in stats.items())
+            )
+        await ctx.send("\n".join(lines) or "No caches yet.")
+
 
 async def setup(bot):
     await bot.add_cog(OwnerCommands(bot))
\ No newline at end of file
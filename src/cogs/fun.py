@@ -3,31 +3,42 @@ from discord.ext import commands
 import asyncio
 import random
 from settings import DANCE_MOVES
+from src.utils.embed_templates import templates
+from src.utils.send_queue import NORMAL
+
+def help_embed():
+    embed = discord.Embed(
+        title="🛠️ Sudo Commands Help",
+        description="Here are all the fun `sudo` commands you can try!",
+        color=discord.Color.green()
+    )
+    embed.add_field(name="apt [package]", value="Simulate installing a package", inline=False)
+    embed.add_field(name="make_me_a_sandwich / sandwich", value="Make the bot give you a sandwich (maybe 🍞)", inline=False)
+    embed.add_field(name="rm_rf [target]", value="Pretend to delete files (safe 😎)", inline=False)
+    embed.add_field(name="dance", value="Make the bot dance with emojis 🕺💃", inline=False)
+    embed.add_field(name="random [command]", value="Run any random sudo command you imagine", inline=False)
+    embed.add_field(name="delete_google", value="Fake-delete Google in a dramatic way 💥 (ends with Wow!)", inline=False)
+    embed.add_field(name="kick", value="Fake for members real for moderators!")
+    embed.set_footer(text="Try 'sudo [command]' and have fun! 🤖")
+    return embed
+
+
+templates.register("sudo help", help_embed)
+
 
 class Fun(commands.Cog):
+    help_category = "fun"
+
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.group(name="sudo", invoke_without_command=False)
+    @commands.group(name="sudo", invoke_without_command=False, extras={"help_name": "sudo help"}, brief="Play with fun sudo commands")
     async def sudo(self, ctx):
         pass
 
     @sudo.command(name="help")
     async def sudo_help(self, ctx):
-        embed = discord.Embed(
-            title="🛠️ Sudo Commands Help",
-            description="Here are all the fun `sudo` commands you can try!",
-            color=discord.Color.green()
-        )
-        embed.add_field(name="apt [package]", value="Simulate installing a package", inline=False)
-        embed.add_field(name="make_me_a_sandwich / sandwich", value="Make the bot give you a sandwich (maybe 🍞)", inline=False)
-        embed.add_field(name="rm_rf [target]", value="Pretend to delete files (safe 😎)", inline=False)
-        embed.add_field(name="dance", value="Make the bot dance with emojis 🕺💃", inline=False)
-        embed.add_field(name="random [command]", value="Run any random sudo command you imagine", inline=False)
-        embed.add_field(name="delete_google", value="Fake-delete Google in a dramatic way 💥 (ends with Wow!)", inline=False)
-        embed.add_field(name="kick", value="Fake for members real for moderators!")
-        embed.set_footer(text="Try 'sudo [command]' and have fun! 🤖")
-        await ctx.send(embed=embed)
+        await ctx.send(embed=templates.get("sudo help"))
 
     @sudo.command(name="apt")
     async def apt(self, ctx, *, description):
@@ -40,7 +51,7 @@ class Fun(commands.Cog):
             "Nothing happened. Maybe try sudo dance? 🕺",
             f"`{description}` mysteriously vanished from the repositories 👻"
         ]
-        await msg.edit(content=random.choice(responses))
+        await self.bot.send_queue.edit(msg, priority=NORMAL, content=random.choice(responses))
 
     @sudo.command(name="make_me_a_sandwich", aliases=["sandwich"])
     async def sandwich(self, ctx):
@@ -53,7 +64,7 @@ class Fun(commands.Cog):
             "You are allergic to sandwiches now! 🤧",
             "Congratulations! You are now the Sandwich King 👑"
         ]
-        await msg.edit(content=random.choice(responses))
+        await self.bot.send_queue.edit(msg, priority=NORMAL, content=random.choice(responses))
 
     @sudo.command(name="rm_rf")
     async def rm_rf(self, ctx, *, target="/"):
@@ -66,7 +77,7 @@ class Fun(commands.Cog):
             "System crashed! JK, reboot not needed 🤖",
             f"Random explosion in '{target}' directory 💥"
         ]
-        await msg.edit(content=random.choice(responses))
+        await self.bot.send_queue.edit(msg, priority=NORMAL, content=random.choice(responses))
 
     @sudo.command(name="dance")
     async def dance(self, ctx):
@@ -76,7 +87,8 @@ class Fun(commands.Cog):
         dance_moves = DANCE_MOVES
         count = random.randint(5, 12)
         for _ in range(count):
-            await msg.edit(content=f"The bot dances: {''.join(random.choices(dance_moves, k=random.randint(3, 7)))}")
+            # Animation frames don't wait, a frame still queued is replaced by the next one
+            self.bot.send_queue.edit(msg, content=f"The bot dances: {''.join(random.choices(dance_moves, k=random.randint(3, 7)))}")
             await asyncio.sleep(random.uniform(0.3, 1.0))
 
         final_responses = [
@@ -84,7 +96,7 @@ class Fun(commands.Cog):
             "The bot collapsed from dancing 😵",
             "Congratulations! You've witnessed a rare dance combo 🏆"
         ]
-        await msg.edit(content=random.choice(final_responses))
+        await self.bot.send_queue.edit(msg, priority=NORMAL, content=random.choice(final_responses))
 
     @sudo.command(name="random")
     async def random_sudo(self, ctx, *, command="something"):
@@ -98,7 +110,7 @@ class Fun(commands.Cog):
             f"You are now the ruler of `{command}` kingdom 👑",
             f"Unexpected side effects occurred while running `{command}` 💥"
         ]
-        await msg.edit(content=random.choice(responses))
+        await self.bot.send_queue.edit(msg, priority=NORMAL, content=random.choice(responses))
 
     @sudo.command(name="delete_google")
     async def delete_google(self, ctx):
@@ -114,7 +126,7 @@ class Fun(commands.Cog):
         ]
         random.shuffle(steps)  # Randomize step order
         for step in steps:
-            await msg.edit(content=step)
+            self.bot.send_queue.edit(msg, content=step)
             await asyncio.sleep(random.uniform(1, 2))
 
         final_responses = [
@@ -122,7 +134,7 @@ class Fun(commands.Cog):
             "💥 Google vanished into an alternate universe! Wow! 😲",
             "🌌 Google is now a concept, not a website! Wow! 😲"
         ]
-        await msg.edit(content=random.choice(final_responses))
+        await self.bot.send_queue.edit(msg, priority=NORMAL, content=random.choice(final_responses))
     
 
 async def setup(bot):
@@ -1,38 +1,55 @@
 import discord
 from discord.ext import commands
+from functools import partial
 from main import PREFIX
 from main import logger
-from settings import CLEAR_COMMAND, INVITE_LINK
-
-# This is our single source of truth for all categories + commands + descriptions
-HELP_DATA = {
-    "fun": {
-        "description": "🎲 Fun commands like jokes and memes",
-        "commands": {
-            PREFIX + "joke help": "Tells a random joke",
-            PREFIX + "meme <count> <subreddit>": "Sends a random meme / send a requested meme with parameters",
-            PREFIX + "8ball <question>": "Ask the magic 8ball a question",
-            PREFIX + "sudo help": "Play with fun sudo commands",
-            PREFIX + "wordle help": "Play wordle game",
-            PREFIX + "maze help": "Play maze game",
-        }
-    },
-    "moderation": {
-        "description": "🛡️ Kick, ban, mute, etc.",
-        "commands": {
-            PREFIX + "clear <amount>": "Clear messages from a channel like purge command!" if CLEAR_COMMAND else "Clear messages from a channel like purge command! (Disabled)",
-        }
-    },
-    "utility": {
-        "description": "🔧 Helpful tools like reminders",
-        "commands": {
-            PREFIX + "profile": "Get your profile info",
-            PREFIX + "profile pic": "Get your profile picture",
-            PREFIX + "embed help": "Get help with embeds and embed builder"
-        }
-    }
+from settings import INVITE_LINK
+from src.utils.embed_templates import templates
+
+# Help categories, their commands come from cogs with a matching help_category.
+# Every command with a brief is listed alphabetically, as its name plus usage or as
+# the help_name in its extras (groups list their help subcommand that way).
+CATEGORIES = {
+    "fun": "🎲 Fun commands like jokes and memes",
+    "moderation": "🛡️ Kick, ban, mute, etc.",
+    "utility": "🔧 Helpful tools like reminders",
 }
 
+
+def help_entries(bot):
+    """category -> {usage: description} for every loaded cog."""
+    entries = {category: {} for category in CATEGORIES}
+    for cog in bot.cogs.values():
+        category = getattr(cog, "help_category", None)
+        if category not in entries:
+            continue
+        for command in cog.walk_commands():
+            if command.brief and not command.hidden:
+                name = command.extras.get("help_name") or " ".join(filter(None, (command.qualified_name, command.usage)))
+                entries[category][PREFIX + name] = command.brief
+    return {category: dict(sorted(listed.items())) for category, listed in entries.items()}
+
+
+def menu_embed():
+    categories_text = "\n".join(f"• **{category}** – {description}" for category, description in CATEGORIES.items())
+    return discord.Embed(
+        title="<:NexusBotprofilepicture:1419717002414653581> Help Menu",
+        description=f"Please type a category name to see its commands:\n\n{categories_text}",
+        color=discord.Color.blue()
+    )
+
+
+def category_embed(category, listed):
+    commands_text = "\n".join(f"`{cmd}` — {desc}" for cmd, desc in listed.items())
+    return discord.Embed(
+        title=f"<:NexusBotprofilepicture:1419717002414653581> {category.capitalize()} Commands",
+        description=f"**{CATEGORIES[category]}**\n\n{commands_text}",
+        color=discord.Color.green()
+    )
+
+
+templates.register("help menu", menu_embed)
+
 class InviteLinkView(discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)  # No timeout for the view
@@ -47,22 +64,21 @@ class InviteLinkView(discord.ui.View):
 class HelpCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.built_for = None
+
+    def category_template(self, category):
+        # Category pages are rebuilt only when the set of loaded cogs changed
+        cogs = tuple(self.bot.cogs)
+        if cogs != self.built_for:
+            for name, listed in help_entries(self.bot).items():
+                templates.register(f"help {name}", partial(category_embed, name, listed))
+            self.built_for = cogs
+        return f"help {category}"
 
     @commands.command(name="help")
     async def help_command(self, ctx):
-        # Build the list of categories dynamically
-        categories_text = "\n".join([
-            f"• **{category}** – {data['description']}"
-            for category, data in HELP_DATA.items()
-        ])
-
         # Send the main help menu embed
-        embed = discord.Embed(
-            title="<:NexusBotprofilepicture:1419717002414653581> Help Menu",
-            description=f"Please type a category name to see its commands:\n\n{categories_text}",
-            color=discord.Color.blue()
-        )
-        menu = await ctx.send(embed=embed, view=InviteLinkView())
+        menu = await ctx.send(embed=templates.get("help menu"), view=InviteLinkView())
         # Function to check user input
         def check(message):
             return (
@@ -78,7 +94,7 @@ class HelpCog(commands.Cog):
                 msg = await self.bot.wait_for("message", check=check, timeout=60.0)
                 content = msg.content.lower()  # lowercase to make matching case-insensitive
 
-                if content in HELP_DATA:
+                if content in CATEGORIES:
                     category = content  # valid category -> exit loop
                 else:
                     # Invalid category -> DM user
@@ -96,36 +112,21 @@ class HelpCog(commands.Cog):
                 return
 
         # Step 5: Once valid category is chosen, show commands + descriptions
-        selected_category = HELP_DATA[category]
-        commands_text = "\n".join([
-            f"`{cmd}` — {desc}" for cmd, desc in selected_category["commands"].items()
-        ])
+        template = self.category_template(category)
 
         try:
             await msg.delete()
         except discord.Forbidden:
             logger.error(f"Help Command: User ({ctx.author.name}, {ctx.author.id}) tried to select category in dms or some internet connection error happened!")
             
-            embed=discord.Embed(
-                        title=f"<:NexusBotprofilepicture:1419717002414653581> {category.capitalize()} Commands",
-                        description=f"**{selected_category['description']}**\n\n{commands_text}",
-                        color=discord.Color.green()
-            )
-            
+            embed = templates.copy(template)
             embed.set_footer(text="BTW this command is better in some server not in dms!")
             
             await ctx.send(embed=embed)
             
             return
             
-        await menu.edit(
-            content="",
-            embed=discord.Embed(
-                title=f"<:NexusBotprofilepicture:1419717002414653581> {category.capitalize()} Commands",
-                description=f"**{selected_category['description']}**\n\n{commands_text}",
-                color=discord.Color.green()
-            )
-        )
+        await menu.edit(content="", embed=templates.get(template))
 
 async def setup(bot):
     await bot.add_cog(HelpCog(bot))
@@ -1,37 +1,137 @@
 import discord
 from discord.ext import commands
-import requests
+import os
+import json
 import random
+import asyncio
+import logging
+from collections import OrderedDict
 from settings import PREFIX
+from src.utils.chunking import send_text
+from src.utils.embed_templates import templates
+from src.utils.prefetch import PrefetchBuffer
+
+# ================= CONFIG =================
+BUFFER_LOW = 10               # Jokes left in a buffer before it is refilled in the background
+BUFFER_HIGH = 30              # Jokes a buffer is filled up to
+JOKE_TTL = 6 * 3600           # Seconds a buffered joke is served before it is refetched
+JOKE_CACHE_FILE = "src/other/joke_cache.json"  # Served when the API is down
+JOKE_CACHE_SIZE = 1000
+# ==========================================
+
+logger = logging.getLogger("discord.bot")
 
 class JokeCog(commands.Cog):
     """Cog for fetching jokes from the Official Joke API"""
 
+    help_category = "fun"
+
     def __init__(self, bot):
         self.bot = bot
         self.api_base = "https://official-joke-api.appspot.com"
         self.categories = ["general", "programming", "knock-knock", "dad"]
 
-    def fetch(self, endpoint: str):
+        # Commands are served from these, the API is only hit in batches of ten
+        self.buffers = {"random": self.make_buffer("random", "random_ten")}
+        for category in self.categories:
+            self.buffers[category] = self.make_buffer(category, f"jokes/{category}/ten")
+        # Every joke seen lately by id, saved to disk for when the API is down
+        self.cache = OrderedDict()
+        self.cache_lock = asyncio.Lock()
+        templates.register("joke help", self.help_embed)
+
+    def make_buffer(self, name, endpoint):
+        async def refill():
+            jokes = await self.bot.http_client.get_json(f"{self.api_base}/{endpoint}")
+            self.remember(jokes)
+            await self.save_cache()
+            return jokes
+        return PrefetchBuffer(f"{name} jokes", refill, BUFFER_LOW, BUFFER_HIGH, JOKE_TTL)
+
+    def help_embed(self):
+        embed = discord.Embed(
+            title="📖 Joke Command Help",
+            description="Here are all available joke commands:",
+            color=discord.Color.green()
+        )
+        embed.add_field(name=PREFIX+"joke", value="Get one random joke.", inline=False)
+        embed.add_field(name=PREFIX+"joke categories", value="Show available categories.", inline=False)
+        embed.add_field(name=PREFIX+"joke joke <number>", value="Get `<number>` random jokes.", inline=False)
+        embed.add_field(name=PREFIX+"joke category <category>", value="Get one random joke from that category.", inline=False)
+        embed.add_field(name=PREFIX+"joke jokes <number> <category>", value="Get `<number>` random jokes from that category.", inline=False)
+        embed.add_field(name="Available Categories", value=", ".join(self.categories), inline=False)
+        return embed
+
+    async def cog_load(self):
+        if os.path.exists(JOKE_CACHE_FILE):
+            jokes = await asyncio.to_thread(self.read_cache)
+            self.cache.update((joke["id"], joke) for joke in jokes)
+        for buffer in self.buffers.values():
+            buffer.refill_soon()
+
+    async def cog_unload(self):
+        for buffer in self.buffers.values():
+            buffer.cancel()
+        await self.save_cache()
+
+    # --- Local cache ---
+    def remember(self, jokes):
+        for joke in jokes:
+            self.cache[joke["id"]] = joke
+            self.cache.move_to_end(joke["id"])
+        while len(self.cache) > JOKE_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    async def save_cache(self):
+        async with self.cache_lock:
+            await asyncio.to_thread(self.write_cache, list(self.cache.values()))
+
+    def read_cache(self):
         try:
-            r = requests.get(f"{self.api_base}/{endpoint}", timeout=5)
-            if r.status_code == 200:
-                return r.json()
-            return None
-        except Exception as e:
-            print(f"Error fetching jokes: {e}")
-            return None
+            with open(JOKE_CACHE_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError as e:
+            logger.warning(f"Ignoring broken joke cache: {e}")
+            return []
+
+    def write_cache(self, jokes):
+        tmp_path = JOKE_CACHE_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(jokes, f)
+        os.replace(tmp_path, JOKE_CACHE_FILE)
+
+    def cached(self, category, exclude=()):
+        """Jokes of this category in the local cache, leaving out the ids in exclude."""
+        return [
+            joke for joke in self.cache.values()
+            if joke["id"] not in exclude and category in ("random", joke.get("type"))
+        ]
+
+    async def get_jokes(self, category: str, number: int):
+        """Up to number jokes from memory, only waits on the API when nothing of this category is cached."""
+        buffer = self.buffers[category]
+        jokes = buffer.take(number)
+        if len(jokes) < number:
+            spare = self.cached(category, {joke["id"] for joke in jokes})
+            if not spare:
+                # Cold buffer and nothing to fall back on, wait for its batch (fails fast while the API is skipped)
+                await buffer.fill()
+                jokes += buffer.take(number - len(jokes))
+                spare = self.cached(category, {joke["id"] for joke in jokes})
+            # Buffer drained or the API is down, top up from the local cache meanwhile
+            jokes += random.sample(spare, min(max(0, number - len(jokes)), len(spare)))
+        return jokes
 
     def format_joke(self, joke):
         return f"**{joke['setup']}**\n{joke['punchline']}"
 
     # --- Main group ---
-    @commands.group(name="joke", invoke_without_command=True)
+    @commands.group(name="joke", invoke_without_command=True, extras={"help_name": "joke help"}, brief="Tells a random joke")
     async def joke(self, ctx):
         """!joke → Get one random joke"""
-        joke = self.fetch("random_joke")
-        if joke:
-            await ctx.send(self.format_joke(joke))
+        jokes = await self.get_jokes("random", 1)
+        if jokes:
+            await ctx.send(self.format_joke(jokes[0]))
         else:
             await ctx.send("⚠️ Couldn't fetch a joke right now.")
 
@@ -39,19 +139,7 @@ class JokeCog(commands.Cog):
     @joke.command(name="help")
     async def joke_help(self, ctx):
         """!joke help → Show command usage"""
-        embed = discord.Embed(
-            title="📖 Joke Command Help",
-            description="Here are all available joke commands:",
-            color=discord.Color.green()
-        )
-        embed.add_field(name=PREFIX+"joke", value="Get one random joke.", inline=False)
-        embed.add_field(name=PREFIX+"joke categories", value="Show available categories.", inline=False)
-        embed.add_field(name=PREFIX+"joke joke <number>", value="Get `<number>` random jokes.", inline=False)
-        embed.add_field(name=PREFIX+"joke category <category>", value="Get one random joke from that category.", inline=False)
-        embed.add_field(name=PREFIX+"joke jokes <number> <category>", value="Get `<number>` random jokes from that category.", inline=False)
-        embed.add_field(name="Available Categories", value=", ".join(self.categories), inline=False)
-
-        await ctx.send(embed=embed)
+        await ctx.send(embed=templates.get("joke help"))
 
     # --- Subcommands ---
     @joke.command(name="categories")
@@ -62,11 +150,10 @@ class JokeCog(commands.Cog):
     @joke.command(name="joke")
     async def single_jokes(self, ctx, number: int):
         """!joke joke <number> → Get <number> random jokes"""
-        number = min(number, 10)  # API only provides 10 random at once
-        jokes = self.fetch("random_ten")
+        number = min(number, 10)  # Keep one message readable
+        jokes = await self.get_jokes("random", number)
         if jokes:
-            selected = random.sample(jokes, min(number, len(jokes)))
-            await ctx.send("\n\n".join(self.format_joke(j) for j in selected))
+            await send_text(ctx, [self.format_joke(j) for j in jokes])
         else:
             await ctx.send("⚠️ Couldn't fetch jokes right now.")
 
@@ -78,7 +165,7 @@ class JokeCog(commands.Cog):
             await ctx.send(f"❌ Invalid category. Try: {', '.join(self.categories)}")
             return
 
-        jokes = self.fetch(f"jokes/{category}/random")
+        jokes = await self.get_jokes(category, 1)
         if jokes:
             await ctx.send(self.format_joke(jokes[0]))
         else:
@@ -92,10 +179,9 @@ class JokeCog(commands.Cog):
             await ctx.send(f"❌ Invalid category. Try: {', '.join(self.categories)}")
             return
 
-        jokes = self.fetch(f"jokes/{category}/ten")
+        jokes = await self.get_jokes(category, min(number, 10))
         if jokes:
-            selected = random.sample(jokes, min(number, len(jokes)))
-            await ctx.send("\n\n".join(self.format_joke(j) for j in selected))
+            await send_text(ctx, [self.format_joke(j) for j in jokes])
         else:
             await ctx.send("⚠️ Couldn't fetch jokes from that category.")
 
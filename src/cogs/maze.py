@@ -1,8 +1,12 @@
-import os
 import io
-import json
+import time
+import asyncio
+import base64
 import random
-from PIL import Image, ImageDraw, ImageFont
+import threading
+from array import array
+from functools import lru_cache
+from collections import OrderedDict
 
 import discord
 from discord.ext import commands
@@ -11,14 +15,22 @@ from discord.ui import View, Button
 from main import logger, PREFIX
 from settings import MAZE_HEIGHT, MAZE_WIDTH
 from src.config.versions import MAZE_VERSION
-
-SAVE_FILE = "src/games/maze_games.json"
+from src.utils.banded_png import BandedPNG
+from src.utils.embed_templates import templates
+from src.utils.game_store import GameStore, retry_on_conflict
+from src.utils.keyed_lock import KeyedLock
+from src.utils.render_pool import render_pool
 
 # ================= CONFIG =================
 USE_IMAGE_RENDER = True       # Toggle between image and text mode
 CELL_SIZE = 32                # Size of each cell (px)
 FONT_SIZE = 24                # Font size for text (player/goal)
 FONT_PATH = "src/font/arial.ttf"
+PNG_COMPRESS_LEVEL = 1        # zlib level for board images, 1 = fastest
+BOARD_CACHE_SIZE = 256        # Full boards kept for incremental re-rendering
+BOARD_CACHE_IDLE = 600        # Seconds before an unused board is dropped
+
+GOAL_DISTANCE_PERCENTILE = 1.0  # 1.0 = farthest cell from the start, 0.5 = median distance
 
 LEVEL_TO_DARK_MAZE = 5
 LEVEL_TO_DARK_MAZE_VISIBILITY = 5
@@ -42,121 +54,402 @@ PATH = "░"
 
 
 # --- Maze Logic ---
-def create_maze(width: int, height: int):
-    """Generate a random maze using DFS backtracking."""
-    maze = [[WALL for _ in range(width)] for _ in range(height)]
-
-    def carve(x, y):
-        maze[y][x] = PATH
-        directions = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-        random.shuffle(directions)
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 1 <= nx < width - 1 and 1 <= ny < height - 1 and maze[ny][nx] == WALL:
-                maze[y + dy // 2][x + dx // 2] = PATH
-                carve(nx, ny)
-
-    start_x, start_y = random.randrange(1, width, 2), random.randrange(1, height, 2)
-    carve(start_x, start_y)
-
-    # Place player
-    maze[start_y][start_x] = PLAYER
-
-    # Place goal
-    gx, gy = start_x, start_y
-    while (gx, gy) == (start_x, start_y) or maze[gy][gx] == WALL:
-        gx, gy = random.randrange(1, width - 1), random.randrange(1, height - 1)
-    maze[gy][gx] = GOAL
+BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+CHAR_BITS = bytes.maketrans(b"01", b"\x00\x01")
 
-    return maze
+# Bump whenever create_maze turns a seed into different walls. Seeded saves of another
+# version can't be rebuilt, those games restart their level on a new maze when loaded.
+GENERATOR_VERSION = 1
 
 
-def locate_player(maze):
-    for y, row in enumerate(maze):
-        for x, cell in enumerate(row):
-            if cell == PLAYER:
-                return y, x
-    return None, None
+class Maze:
+    """
+    Maze walls packed one bit per cell (1 = wall) with player and goal kept as (row, col).
+    Generated mazes remember their seed and generator version so saves only need those and
+    the positions, as long as create_maze still carves the same walls from the seed.
+    optimal is the length of the shortest path from the start to the goal.
+    """
+    __slots__ = ("width", "height", "walls", "player", "goal", "seed", "generator", "optimal")
+
+    def __init__(self, width: int, height: int, walls: bytearray = None, player=(0, 0), goal=(0, 0), seed=None, optimal=None, generator=None):
+        self.width = width
+        self.height = height
+        self.walls = walls if walls is not None else bytearray(b"\xff" * ((width * height + 7) // 8))
+        self.player = tuple(player)
+        self.goal = tuple(goal)
+        self.seed = seed
+        self.generator = generator
+        self.optimal = optimal
+
+    def is_wall(self, r, c):
+        i = r * self.width + c
+        return self.walls[i >> 3] >> (i & 7) & 1
+
+    def set_path(self, r, c):
+        i = r * self.width + c
+        self.walls[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def cells(self, top=0, bottom=None, left=0, right=None):
+        """One byte per cell of (a window of) the maze in row order, 1 for walls."""
+        bottom = self.height if bottom is None else bottom
+        right = self.width if right is None else right
+        if (left, right) == (0, self.width):
+            return self.bits(top * self.width, bottom * self.width)
+        # Only the window's rows are unpacked, dark levels stay cheap on huge mazes
+        return b"".join(self.bits(r * self.width + left, r * self.width + right) for r in range(top, bottom))
+
+    def bits(self, start, end):
+        """Cells start..end-1 (flat indices) as one byte each."""
+        if end <= start:
+            return b""
+        first = start >> 3
+        value = int.from_bytes(self.walls[first:(end + 7) >> 3], "little") >> (start - (first << 3))
+        return format(value & ((1 << (end - start)) - 1), f"0{end - start}b")[::-1].encode("ascii").translate(CHAR_BITS)
+
+    def cell(self, r, c):
+        if (r, c) == self.player:
+            return PLAYER
+        if (r, c) == self.goal:
+            return GOAL
+        return WALL if self.is_wall(r, c) else PATH
+
+    def to_rows(self, top=0, bottom=None, left=0, right=None):
+        """Expand (a window of) the maze to the list-of-rows of characters used by the renderers."""
+        bottom = self.height if bottom is None else bottom
+        right = self.width if right is None else right
+        return [[self.cell(r, c) for c in range(left, right)] for r in range(top, bottom)]
+
+    # --- Serialization ---
+    def to_dict(self):
+        data = {
+            "width": self.width,
+            "height": self.height,
+            "player": list(self.player),
+            "goal": list(self.goal),
+            "optimal": self.optimal
+        }
+        if self.seed is not None and self.generator == GENERATOR_VERSION:
+            data["seed"] = self.seed
+            data["generator"] = self.generator
+        else:
+            data["walls"] = base64.b64encode(self.walls).decode("ascii")
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        if "seed" in data:
+            # Seed saves from before the version was stored were made by generator 1
+            generator = data.get("generator", 1)
+            maze = create_maze(data["width"], data["height"], seed=data["seed"]) if generator == GENERATOR_VERSION else None
+            if maze is None or maze.is_wall(*data["player"]):
+                # The seed no longer gives the saved walls, the game restarts its level on a new maze
+                logger.warning(f"Maze saved by generator {generator} can't be rebuilt, starting a new one")
+                return create_maze(data["width"], data["height"])
+            # The saved goal (and its distance) wins, goal placement may have changed since the save
+            goal = tuple(data["goal"])
+            if "optimal" in data:
+                maze.optimal = data["optimal"]
+            elif goal != maze.goal:
+                # Saved before the distance was stored, measure it from the start (still the player here)
+                maze.goal = goal
+                maze.optimal = shortest_path(maze)
+            maze.player, maze.goal = tuple(data["player"]), goal
+            return maze
+        return cls(data["width"], data["height"], bytearray(base64.b64decode(data["walls"])),
+                   data["player"], data["goal"], optimal=data.get("optimal"))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Convert a maze saved in the old list-of-rows format."""
+        maze = cls(len(rows[0]), len(rows))
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                if cell != WALL:
+                    maze.set_path(r, c)
+                if cell == PLAYER:
+                    maze.player = (r, c)
+                elif cell == GOAL:
+                    maze.goal = (r, c)
+
+        # Old mazes could have paths on the border, pad with walls so the BFS stays inside
+        width = maze.width + 2
+        grid = bytearray(b"\x01") * width * (maze.height + 2)
+        for r in range(maze.height):
+            for c in range(maze.width):
+                grid[(r + 1) * width + c + 1] = maze.is_wall(r, c)
+        start = (maze.player[0] + 1) * width + maze.player[1] + 1
+        goal = (maze.goal[0] + 1) * width + maze.goal[1] + 1
+        for distance, level in enumerate(distance_field(grid, width, start)):
+            if goal in level:
+                maze.optimal = distance
+        return maze
+
+
+def distance_field(grid, width: int, start: int):
+    """
+    BFS over the open cells of a flat grid (0 = path).
+    Returns a list where entry d holds every cell index exactly d steps from start.
+    """
+    dist = array("i", [-1]) * len(grid)
+    dist[start] = 0
+    steps = (1, -1, width, -width)
+    levels = [[start]]
+    while True:
+        frontier = []
+        for i in levels[-1]:
+            for step in steps:
+                j = i + step
+                if dist[j] < 0 and not grid[j]:
+                    dist[j] = len(levels)
+                    frontier.append(j)
+        if not frontier:
+            return levels
+        levels.append(frontier)
+
+
+def shortest_path(maze):
+    """Steps from the player to the goal of a maze with a wall border, None if unreachable."""
+    start = maze.player[0] * maze.width + maze.player[1]
+    goal = maze.goal[0] * maze.width + maze.goal[1]
+    for distance, level in enumerate(distance_field(maze.cells(), maze.width, start)):
+        if goal in level:
+            return distance
+    return None
+
+
+def create_maze(width: int, height: int, seed: int = None):
+    """
+    Generate a maze using DFS backtracking with an explicit stack.
+    The same seed, size and GENERATOR_VERSION always give the same maze.
+    """
+    # Smaller grids have a single open cell, leaving nowhere to put the goal
+    if width < 5 or height < 5:
+        raise ValueError(f"Maze must be at least 5x5, got {width}x{height}")
+    if seed is None:
+        seed = random.getrandbits(32)
+    rng = random.Random(seed)
+    size = width * height
+
+    # One byte per cell while carving, packed into bits at the end
+    grid = bytearray(b"\x01") * size
+    unvisited = bytearray(size)
+    for r in range(1, height - 1, 2):
+        row = r * width
+        unvisited[row + 1:row + width - 1:2] = b"\x01" * len(range(1, width - 1, 2))
+
+    start_x, start_y = rng.randrange(1, width - 1, 2), rng.randrange(1, height - 1, 2)
+    start = start_y * width + start_x
+    grid[start] = unvisited[start] = 0
+
+    steps = (2, -2, 2 * width, -2 * width)
+    stack = [start]
+    while stack:
+        i = stack[-1]
+        options = [i + d for d in steps if 0 <= i + d < size and unvisited[i + d]]
+        if not options:
+            stack.pop()
+            continue
+        j = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        grid[j] = unvisited[j] = 0
+        grid[(i + j) >> 1] = 0
+        stack.append(j)
+
+    # Cell i becomes bit i, lowest bit first
+    walls = int(grid.translate(BIT_CHARS)[::-1], 2).to_bytes((size + 7) // 8, "little")
+    maze = Maze(width, height, bytearray(walls), player=(start_y, start_x), seed=seed, generator=GENERATOR_VERSION)
+
+    # Place goal at the chosen percentile of path distance from the start
+    levels = distance_field(grid, width, start)
+    reachable = sum(len(level) for level in levels) - 1
+    rank = max(1, round(GOAL_DISTANCE_PERCENTILE * reachable))
+    seen = 0
+    for distance, level in enumerate(levels[1:], start=1):
+        seen += len(level)
+        if seen >= rank:
+            break
+    goal = rng.choice(level)
+    maze.goal = divmod(goal, width)
+    maze.optimal = distance
+
+    return maze
 
 
 # --- Rendering ---
 def render_board_text(maze, level, moves):
-    rows = [" ".join(r) for r in maze]
+    rows = [" ".join(r) for r in maze.to_rows()]
     return f"Level: {level} | Moves: {moves}\n```\n" + "\n".join(rows) + "\n```"
 
 
-def render_board_image(maze, level, moves, player_view=None):
-    """
-    Render maze board as an image with Pillow.
-    player_view: int | None -> only render square of size player_view around player
-    """
-    # If blind/dark level, create viewport
-    if player_view:
-        r, c = locate_player(maze)
-        h = len(maze)
-        w = len(maze[0])
-        half = player_view // 2
-        top = max(r - half, 0)
-        bottom = min(r + half + 1, h)
-        left = max(c - half, 0)
-        right = min(c + half + 1, w)
-        maze_view = [row[left:right] for row in maze[top:bottom]]
-    else:
-        maze_view = maze
+# Board images use one shared palette: path, wall, grid, then GLYPH_SHADES anti-aliasing
+# steps from the path colour to the player colour and the same for the goal colour.
+GLYPH_SHADES = 16
+PALETTE_INDEX = {"path": 0, "wall": 1, "grid": 2, PLAYER: 3, GOAL: 3 + GLYPH_SHADES}
 
-    width = len(maze_view[0]) * CELL_SIZE
-    height = len(maze_view) * CELL_SIZE
-    img = Image.new("RGB", (width, height), COLORS["path"])
-    draw = ImageDraw.Draw(img)
 
+def board_palette():
+    palette = list(COLORS["path"] + COLORS["wall"] + COLORS["grid"])
+    for color in (COLORS["player"], COLORS["goal"]):
+        for step in range(GLYPH_SHADES):
+            t = step / (GLYPH_SHADES - 1)
+            palette += [round(p + (g - p) * t) for p, g in zip(COLORS["path"], color)]
+    return palette
+
+
+@lru_cache(maxsize=None)
+def load_font():
+    from PIL import ImageFont
     try:
-        font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+        return ImageFont.truetype(FONT_PATH, FONT_SIZE)
     except Exception:
-        font = ImageFont.load_default()
+        return ImageFont.load_default()
+
 
-    def get_text_size(text, font):
+@lru_cache(maxsize=None)
+def tile_atlas(cell_size: int):
+    """
+    Pre-rendered palette tiles for one cell size.
+    Each tile carries the grid line on its top and left edge, like every cell on the board.
+    """
+    from PIL import Image, ImageDraw
+    font = load_font()
+    path = Image.new("P", (cell_size, cell_size), PALETTE_INDEX["path"])
+    draw = ImageDraw.Draw(path)
+    draw.line([(0, 0), (cell_size - 1, 0)], fill=PALETTE_INDEX["grid"])
+    draw.line([(0, 0), (0, cell_size - 1)], fill=PALETTE_INDEX["grid"])
+    tiles = {PATH: path}
+    for char in (PLAYER, GOAL):
+        mask = Image.new("L", (cell_size, cell_size), 0)
+        draw = ImageDraw.Draw(mask)
         try:
-            bbox = draw.textbbox((0, 0), text, font=font)  # Pillow >= 10
-            return bbox[2] - bbox[0], bbox[3] - bbox[1]
+            bbox = draw.textbbox((0, 0), char, font=font)  # Pillow >= 10
+            w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
         except AttributeError:
-            return draw.textsize(text, font=font)
-
-    for y, row in enumerate(maze_view):
-        for x, cell in enumerate(row):
-            px, py = x * CELL_SIZE, y * CELL_SIZE
-            rect = [px, py, px + CELL_SIZE, py + CELL_SIZE]
-
-            # If blind level, unknown cells are fog
-            if player_view and cell not in (PLAYER, GOAL, WALL, PATH):
-                draw.rectangle(rect, fill=COLORS["fog"])
-                draw.rectangle(rect, outline=COLORS["grid"], width=1)
-                continue
-
-            if cell == WALL:
-                draw.rectangle(rect, fill=COLORS["wall"])
-            elif cell == PATH:
-                draw.rectangle(rect, fill=COLORS["path"])
-            elif cell == PLAYER:
-                draw.rectangle(rect, fill=COLORS["path"])
-                w, h = get_text_size(PLAYER, font)
-                draw.text((px + (CELL_SIZE - w) / 2, py + (CELL_SIZE - h) / 2),
-                          PLAYER, fill=COLORS["player"], font=font)
-            elif cell == GOAL:
-                draw.rectangle(rect, fill=COLORS["path"])
-                w, h = get_text_size(GOAL, font)
-                draw.text((px + (CELL_SIZE - w) / 2, py + (CELL_SIZE - h) / 2),
-                          GOAL, fill=COLORS["goal"], font=font)
-
-            # grid lines
-            draw.rectangle(rect, outline=COLORS["grid"], width=1)
+            w, h = draw.textsize(char, font=font)
+        draw.text(((cell_size - w) / 2, (cell_size - h) / 2), char, fill=255, font=font)
+
+        # Glyph coverage -> shade index, no coverage stays plain path
+        base = PALETTE_INDEX[char]
+        lut = [0] + [base + max(1, round(a * (GLYPH_SHADES - 1) / 255)) for a in range(1, 256)]
+        tile = mask.point(lut).convert("P")
+        draw = ImageDraw.Draw(tile)
+        draw.line([(0, 0), (cell_size - 1, 0)], fill=PALETTE_INDEX["grid"])
+        draw.line([(0, 0), (0, cell_size - 1)], fill=PALETTE_INDEX["grid"])
+        tiles[char] = tile
+    return tiles
+
 
+def draw_board(maze, top, bottom, left, right):
+    """
+    Draw the cells in [top, bottom) x [left, right) as a palette image.
+    Walls and paths come from a one pixel per cell image scaled up with nearest neighbour,
+    grid lines are drawn once per row/column and the player/goal tiles are pasted on top.
+    """
+    from PIL import Image, ImageDraw
+    cols, rows = right - left, bottom - top
+    cells = maze.cells(top, bottom, left, right)
+
+    board = Image.frombytes("P", (cols, rows), cells)
+    board = board.resize((cols * CELL_SIZE, rows * CELL_SIZE), Image.NEAREST)
+    board.putpalette(board_palette())
+    width, height = board.size
+
+    draw = ImageDraw.Draw(board)
+    for x in range(0, width, CELL_SIZE):
+        draw.line([(x, 0), (x, height - 1)], fill=PALETTE_INDEX["grid"])
+    for y in range(0, height, CELL_SIZE):
+        draw.line([(0, y), (width - 1, y)], fill=PALETTE_INDEX["grid"])
+
+    tiles = tile_atlas(CELL_SIZE)
+    for char, (r, c) in ((GOAL, maze.goal), (PLAYER, maze.player)):
+        if top <= r < bottom and left <= c < right:
+            board.paste(tiles[char], ((c - left) * CELL_SIZE, (r - top) * CELL_SIZE))
+    return board
+
+
+# --- Board cache ---
+# Full boards of running games, a move only repaints the old and new player cell and
+# recompresses the PNG bands of those cell rows, see src/utils/banded_png.py.
+# Renders run on pool threads, BOARD_CACHE_LOCK guards the cache itself and each
+# entry's own lock is held while its image is repainted and encoded, so two renders
+# of the same game (a button click and `maze board`) never touch the image at once.
+# Only used with thread rendering, process workers would each keep their own copy.
+BOARD_CACHE = OrderedDict()
+BOARD_CACHE_LOCK = threading.Lock()
+
+
+def encode_png(board):
     buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
+    board.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
     buffer.seek(0)
     return buffer
 
 
-async def send_board(ctx_or_interaction, maze, level, moves, title="Maze Game", view=None):
+def cached_board_png(game_id, maze):
+    now = time.monotonic()
+    with BOARD_CACHE_LOCK:
+        # Least recently used first, drop boards of idle games
+        while BOARD_CACHE:
+            oldest = next(iter(BOARD_CACHE.values()))
+            if now - oldest["used"] < BOARD_CACHE_IDLE:
+                break
+            BOARD_CACHE.popitem(last=False)
+
+        entry = BOARD_CACHE.get(game_id)
+        if not entry or entry["walls"] != maze.walls or entry["goal"] != maze.goal:
+            # New game or level, drawn below under the entry's lock
+            entry = BOARD_CACHE[game_id] = {
+                "lock": threading.Lock(),
+                "image": None,
+                "png": None,
+                "walls": bytes(maze.walls),
+                "goal": maze.goal,
+                "player": maze.player
+            }
+        entry["used"] = now
+        BOARD_CACHE.move_to_end(game_id)
+        while len(BOARD_CACHE) > BOARD_CACHE_SIZE:
+            BOARD_CACHE.popitem(last=False)
+
+    with entry["lock"]:
+        if entry["image"] is None:
+            entry["image"] = draw_board(maze, 0, maze.height, 0, maze.width)
+            entry["png"] = BandedPNG(entry["image"], CELL_SIZE, PNG_COMPRESS_LEVEL)
+            entry["player"] = maze.player
+        elif entry["player"] != maze.player:
+            tiles = tile_atlas(CELL_SIZE)
+            for (r, c), tile in ((entry["player"], tiles[PATH]), (maze.player, tiles[PLAYER])):
+                entry["image"].paste(tile, (c * CELL_SIZE, r * CELL_SIZE))
+                entry["png"].update(entry["image"], r * CELL_SIZE, (r + 1) * CELL_SIZE)
+            entry["player"] = maze.player
+        return io.BytesIO(entry["png"].png())
+
+
+def evict_board(game_id):
+    with BOARD_CACHE_LOCK:
+        BOARD_CACHE.pop(game_id, None)
+
+
+def render_board_image(maze, level, moves, player_view=None, game_id=None):
+    """
+    Render maze board as an image with Pillow.
+    player_view: int | None -> only render square of size player_view around player
+    game_id: str | None -> keep the full board cached and only repaint what changed
+    """
+    # If blind/dark level, create viewport from the player position, only those cells are drawn
+    if player_view:
+        r, c = maze.player
+        half = player_view // 2
+        top = max(r - half, 0)
+        bottom = min(r + half + 1, maze.height)
+        left = max(c - half, 0)
+        right = min(c + half + 1, maze.width)
+        return encode_png(draw_board(maze, top, bottom, left, right))
+    if game_id is not None:
+        return cached_board_png(game_id, maze)
+    return encode_png(draw_board(maze, 0, maze.height, 0, maze.width))
+
+
+async def send_board(ctx_or_interaction, maze, level, moves, title="Maze Game", view=None, game_id=None):
     """Send board as embed + image OR embed + text depending on config."""
     # Determine blind view
     player_view = None
@@ -165,7 +458,9 @@ async def send_board(ctx_or_interaction, maze, level, moves, title="Maze Game",
         title += " 🌑 Dark Maze"
 
     if USE_IMAGE_RENDER:
-        buffer = render_board_image(maze, level, moves, player_view=player_view)
+        # The board cache lives in this process, skip it when rendering in worker processes
+        cache_id = game_id if render_pool.mode == "thread" else None
+        buffer = await render_pool.run(render_board_image, maze, level, moves, player_view, cache_id)
         file = discord.File(buffer, filename="maze.png")
         embed = discord.Embed(title=title, description=f"Level: {level} | Moves: {moves}")
         embed.set_image(url="attachment://maze.png")
@@ -185,16 +480,15 @@ async def send_board(ctx_or_interaction, maze, level, moves, title="Maze Game",
 
 
 # --- Save / Load ---
-def save_games(games):
-    with open(SAVE_FILE, "w") as f:
-        json.dump(games, f)
+def encode_game(game):
+    return {**game, "maze": game["maze"].to_dict()}
 
 
-def load_games():
-    if os.path.exists(SAVE_FILE):
-        with open(SAVE_FILE, "r") as f:
-            return json.load(f)
-    return {}
+def decode_game(game):
+    maze = game["maze"]
+    # Saves from before 1.3.0 stored the maze as rows of characters
+    game["maze"] = Maze.from_rows(maze) if isinstance(maze, list) else Maze.from_dict(maze)
+    return game
 
 
 # --- UI View ---
@@ -235,111 +529,145 @@ class MazeView(View):
         if str(interaction.user.id) != self.user_id:
             return await interaction.response.send_message("❌ Not your game.", ephemeral=True)
 
+        # Clicks of one player are handled one after another, other players never wait.
+        # In cluster mode a click racing one on another shard is redone on the saved game
+        async with self.cog.locks(self.user_id):
+            await retry_on_conflict(lambda: self.apply_button(interaction, button_id))
+
+    async def apply_button(self, interaction: discord.Interaction, button_id: str):
         if button_id == "stop":
-            if self.user_id in self.cog.games:
-                game = self.cog.games[self.user_id]
-                del self.cog.games[self.user_id]
-                save_games(self.cog.games)
+            game = await self.cog.games.get(self.user_id)
+            if game:
+                self.cog.games.delete(self.user_id)
+                evict_board(self.user_id)
                 return await send_board(interaction, game["maze"], game["level"], game["moves"], title="🛑 Game Ended", view=None)
             return await interaction.response.send_message("⚠️ No active game.", ephemeral=True)
 
         moves = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
         dr, dc = moves[button_id]
 
-        game = self.cog.games.get(self.user_id)
+        game = await self.cog.games.get(self.user_id)
         if not game:
             return await interaction.response.send_message(f"⚠️ No active game. Start one with `{PREFIX}maze start`.", ephemeral=True)
 
         maze, level, move_count = game["maze"], game["level"], game["moves"]
-        r, c = locate_player(maze)
+        r, c = maze.player
         nr, nc = r + dr, c + dc
 
-        if not (0 <= nr < len(maze) and 0 <= nc < len(maze[0])):
+        if not (0 <= nr < maze.height and 0 <= nc < maze.width):
             return await interaction.response.send_message("🚧 Outside bounds!", ephemeral=True)
-        if maze[nr][nc] == WALL:
+        if maze.is_wall(nr, nc):
             return await interaction.response.send_message("❌ You hit a wall!", ephemeral=True)
 
-        if maze[nr][nc] == GOAL:
+        if (nr, nc) == maze.goal:
+            # Shortest path vs. moves used, the step onto the goal counts too
+            if maze.optimal:
+                game["efficiency"] = round(100 * maze.optimal / (move_count + 1))
+            # Big levels take a while to generate, keep it off the event loop
+            next_maze = await asyncio.to_thread(create_maze, game["width"] + 2, game["height"] + 2)
             game["level"] += 1
             game["moves"] = 0
             game["width"] += 2
             game["height"] += 2
-            game["maze"] = create_maze(game["width"], game["height"])
-            save_games(self.cog.games)
-            return await send_board(interaction, game["maze"], game["level"], game["moves"], title="🎉 Level Complete!", view=self)
+            game["maze"] = next_maze
+            await self.cog.games.save(self.user_id, game)
+            return await send_board(interaction, game["maze"], game["level"], game["moves"], title="🎉 Level Complete!", view=self, game_id=self.user_id)
 
         # regular move
-        maze[r][c] = PATH
-        maze[nr][nc] = PLAYER
+        maze.player = (nr, nc)
         game["moves"] += 1
-        save_games(self.cog.games)
+        await self.cog.games.save(self.user_id, game)
 
-        await send_board(interaction, maze, game["level"], game["moves"], title="Maze Game", view=self)
+        await send_board(interaction, maze, game["level"], game["moves"], title="Maze Game", view=self, game_id=self.user_id)
 
 
 # --- Cog ---
+def help_embed():
+    embed = discord.Embed(
+        title="Maze Game 🌀 - Help",
+        description=f"How to play:\n* Start game with `{PREFIX}maze start`\n* Navigate to `{GOAL}` with the buttons\n\nCommands:"
+    )
+    embed.add_field(name=PREFIX+"maze", value="Shows this message!", inline=False)
+    embed.add_field(name=PREFIX+"maze start", value="Starts a maze game!", inline=False)
+    embed.add_field(name=PREFIX+"maze here", value="Calls maze game to channel!", inline=False)
+    embed.add_field(name=PREFIX+"maze board", value="Shows current board.", inline=False)
+    embed.add_field(name=PREFIX+"maze status", value="Shows status of maze game.", inline=False)
+    embed.set_footer(text=f"Help command for maze game! | Version: {MAZE_VERSION}")
+    return embed
+
+
+templates.register("maze help", help_embed)
+
+
 class MazeGame(commands.Cog):
+    help_category = "fun"
+
     def __init__(self, bot):
         self.bot = bot
-        self.games = load_games()
+        self.games = GameStore("maze_games", encode=encode_game, decode=decode_game)
+        self.locks = KeyedLock()
 
-    @commands.group(name="maze", invoke_without_command=True)
+    async def cog_load(self):
+        await self.games.open()
+
+    async def cog_unload(self):
+        await self.games.close()
+
+    @commands.group(name="maze", invoke_without_command=True, extras={"help_name": "maze help"}, brief="Play maze game")
     async def maze(self, ctx):
-        embed = discord.Embed(
-            title="Maze Game 🌀 - Help",
-            description=f"How to play:\n* Start game with `{PREFIX}maze start`\n* Navigate to `{GOAL}` with the buttons\n\nCommands:"
-        )
-        embed.add_field(name=PREFIX+"maze", value="Shows this message!", inline=False)
-        embed.add_field(name=PREFIX+"maze start", value="Starts a maze game!", inline=False)
-        embed.add_field(name=PREFIX+"maze here", value="Calls maze game to channel!", inline=False)
-        embed.add_field(name=PREFIX+"maze board", value="Shows current board.", inline=False)
-        embed.add_field(name=PREFIX+"maze status", value="Shows status of maze game.", inline=False)
-        embed.set_footer(text=f"Help command for maze game! | Version: {MAZE_VERSION}")
-        await ctx.send(embed=embed)
+        await ctx.send(embed=templates.get("maze help"))
 
     @maze.command(name="start")
     async def start_maze(self, ctx):
         user_id = str(ctx.author.id)
+        async with self.locks(user_id):
+            await retry_on_conflict(lambda: self.create_game(ctx, user_id))
 
-        if user_id in self.games:
+    async def create_game(self, ctx, user_id):
+        # get() instead of `in`, in cluster mode the game may have been started on another shard
+        if await self.games.get(user_id) is not None:
             return await ctx.send(f"⚠️ You have an active game. Use `{PREFIX}maze board` or `{PREFIX}maze here`")
 
         width, height = MAZE_WIDTH, MAZE_HEIGHT
         maze = create_maze(width, height)
-        self.games[user_id] = {
+        game = {
             "maze": maze,
             "level": 1,
             "moves": 0,
             "width": width,
             "height": height
         }
-        save_games(self.games)
-        await send_board(ctx, maze, 1, 0, title="Maze Game 🌀", view=MazeView(self, user_id))
+        await self.games.save(user_id, game)
+        await send_board(ctx, maze, 1, 0, title="Maze Game 🌀", view=MazeView(self, user_id), game_id=user_id)
 
     @maze.command(name="here")
     async def maze_here(self, ctx):
         user_id = str(ctx.author.id)
-        if user_id not in self.games:
+        game = await self.games.get(user_id)
+        if game is None:
             return await ctx.send(f"⚠️ No active game. Start one with `{PREFIX}maze start`.")
-        game = self.games[user_id]
-        await send_board(ctx, game["maze"], game["level"], game["moves"], title="🌀 Maze Here", view=MazeView(self, user_id))
+        await send_board(ctx, game["maze"], game["level"], game["moves"], title="🌀 Maze Here", view=MazeView(self, user_id), game_id=user_id)
 
     @maze.command(name="board")
     async def maze_board(self, ctx):
         user_id = str(ctx.author.id)
-        if user_id not in self.games:
+        game = await self.games.get(user_id)
+        if game is None:
             return await ctx.send(f"⚠️ No active game. Start one with `{PREFIX}maze start`.")
-        game = self.games[user_id]
-        await send_board(ctx, game["maze"], game["level"], game["moves"], title="🌀 Maze Board")
+        await send_board(ctx, game["maze"], game["level"], game["moves"], title="🌀 Maze Board", game_id=user_id)
 
     @maze.command(name="status")
     async def maze_status(self, ctx):
         user_id = str(ctx.author.id)
-        if user_id not in self.games:
+        game = await self.games.get(user_id)
+        if game is None:
             return await ctx.send(f"⚠️ No active game. Start one with `{PREFIX}maze start`.")
-        game = self.games[user_id]
         embed = discord.Embed(title="🌀 Maze Status")
         embed.add_field(name="Status:", value=f"Level: {game['level']} | Moves: {game['moves']}", inline=False)
+        if game["maze"].optimal:
+            embed.add_field(name="Shortest path:", value=f"{game['maze'].optimal} moves", inline=False)
+        if "efficiency" in game:
+            embed.add_field(name="Last level efficiency:", value=f"{game['efficiency']}%", inline=False)
         embed.set_footer(text=f"Version: {MAZE_VERSION}")
         await ctx.send(embed=embed)
 
@@ -1,44 +1,102 @@
 import discord
 from discord.ext import commands
-import requests
 import asyncio
+from collections import OrderedDict
+from src.utils.chunking import send_embeds
+from src.utils.prefetch import PrefetchBuffer
+
+# ================= CONFIG =================
+MEME_BATCH = 50               # Memes per bulk request, the most the API returns at once
+POOL_LOW = 10                 # Memes left in a pool before it is refilled in the background
+POOL_HIGH = 50
+MEME_TTL = 30 * 60            # Seconds a prefetched meme is served before it is dropped
+MAX_POOLS = 32                # Subreddits kept, the least recently used is dropped first
+SEEN_PER_CHANNEL = 200        # Posts remembered per channel so they aren't repeated there
+MAX_SEEN_CHANNELS = 1000
+COLD_TIMEOUT = 8              # Seconds a command waits for a cold pool, the refill keeps going after that
+# ==========================================
+
+def post_id(meme):
+    return meme.get("postLink") or meme.get("url")
 
 class MemeCog(commands.Cog):
     """Cog for fetching memes using D3vd Meme API"""
 
+    help_category = "fun"
+
     def __init__(self, bot, api_base: str = None):
         self.bot = bot
         self.api_base = api_base or "https://meme-api.com/gimme"  # newer endpoint
+        # Memes are prefetched in bulk per subreddit ("" for any) and served from memory
+        self.pools = OrderedDict()
+        self.seen = OrderedDict()  # channel id -> post ids sent there lately
 
     async def fetch_meme(self, url: str):
-        """Fetch meme JSON in a thread to avoid blocking"""
-        def get_data():
-            r = requests.get(url, timeout=8)
-            return r.json()
-        return await asyncio.to_thread(get_data)
+        """Fetch meme JSON through the bot's shared HTTP client"""
+        return await self.bot.http_client.get_json(url)
+
+    def pool(self, subreddit: str):
+        pool = self.pools.get(subreddit)
+        if pool is None:
+            url = f"{self.api_base}/{subreddit}/{MEME_BATCH}" if subreddit else f"{self.api_base}/{MEME_BATCH}"
+
+            async def refill():
+                data = await self.fetch_meme(url)
+                return data.get("memes") if isinstance(data, dict) and "memes" in data else [data]
+
+            pool = self.pools[subreddit] = PrefetchBuffer(
+                f"r/{subreddit or 'any'} memes", refill, POOL_LOW, POOL_HIGH, MEME_TTL, key=post_id
+            )
+            while len(self.pools) > MAX_POOLS:
+                self.pools.popitem(last=False)[1].cancel()
+        self.pools.move_to_end(subreddit)
+        return pool
+
+    def seen_in(self, channel_id):
+        seen = self.seen.pop(channel_id, None) or OrderedDict()
+        self.seen[channel_id] = seen
+        while len(self.seen) > MAX_SEEN_CHANNELS:
+            self.seen.popitem(last=False)
+        return seen
 
-    @commands.command(name="meme", help="Fetches random meme(s).")
+    async def get_memes(self, channel_id, subreddit: str, count: int):
+        """Memes not sent to this channel lately, straight from memory when the pool is warm."""
+        pool = self.pool(subreddit)
+        seen = self.seen_in(channel_id)
+        already_seen = lambda meme: post_id(meme) in seen
+
+        memes = pool.take(count, skip=already_seen)
+        if len(memes) < count:
+            # Cold or drained pool, wait for one bulk refill but not for every retry of a hanging API
+            try:
+                await asyncio.wait_for(pool.fill(), COLD_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            memes += pool.take(count - len(memes), skip=already_seen)
+
+        for meme in memes:
+            seen[post_id(meme)] = None
+        while len(seen) > SEEN_PER_CHANNEL:
+            seen.popitem(last=False)
+        return memes
+
+    def cog_unload(self):
+        for pool in self.pools.values():
+            pool.cancel()
+
+    @commands.command(name="meme", help="Fetches random meme(s).", usage="<count> <subreddit>",
+                      brief="Sends a random meme / send a requested meme with parameters")
     async def meme(self, ctx: commands.Context, count: int = 1, *, subreddit: str = None):
         # clamp count between 1–10 to avoid spam
         count = max(1, min(count, 10))
 
-        if subreddit:
-            url = f"{self.api_base}/{subreddit}/{count}"
-        else:
-            url = f"{self.api_base}/{count}"
-
-        try:
-            data = await self.fetch_meme(url)
-        except Exception as e:
-            await ctx.send("⚠️ Error fetching meme(s)")
-            return
-
-        memes = data.get("memes") if isinstance(data, dict) and "memes" in data else [data]
+        memes = await self.get_memes(ctx.channel.id, (subreddit or "").lower(), count)
 
         if not memes:
             await ctx.send("Couldn't get meme 😢")
             return
 
+        embeds = []
         for meme in memes:
             embed = discord.Embed(
                 title=meme.get("title", "Meme"),
@@ -47,7 +105,8 @@ class MemeCog(commands.Cog):
                 url=meme.get("postLink")
             )
             embed.set_image(url=meme["url"])
-            await ctx.send(embed=embed)
+            embeds.append(embed)
+        await send_embeds(ctx, embeds)
 
 async def setup(bot):
     await bot.add_cog(MemeCog(bot))
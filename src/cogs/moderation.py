@@ -3,10 +3,15 @@ from discord.ext import commands
 from settings import CLEAR_COMMAND
 
 class Moderation(commands.Cog):
+    help_category = "moderation"
+
     def __init__(self, bot):
         self.bot = bot
 
-    @commands.command(name="clear", description="Deletes a specified number of messages.")
+    @commands.command(
+        name="clear", description="Deletes a specified number of messages.", usage="<amount>",
+        brief="Clear messages from a channel like purge command!" if CLEAR_COMMAND else "Clear messages from a channel like purge command! (Disabled)"
+    )
     @commands.bot_has_permissions(manage_messages=True)
     @commands.has_permissions(manage_messages=True)
     async def clear(self, ctx, messages: int):
@@ -1,18 +1,38 @@
 import discord
 from discord.ext import commands
+from src.utils.ttl_cache import TTLCache
+
+# ================= CONFIG =================
+USER_CACHE_SIZE = 5000        # Users kept for profile lookups
+USER_TTL = 10 * 60            # Seconds a fetched user is reused
+UNKNOWN_USER_TTL = 60         # Seconds an id Discord doesn't know is remembered
+# ==========================================
 
 class Profile(commands.Cog):
+    help_category = "utility"
+
     def __init__(self, bot):
         self.bot = bot
+        self.users = TTLCache("users", USER_CACHE_SIZE, USER_TTL, UNKNOWN_USER_TTL)
+
+    async def fetch_user(self, user_id):
+        try:
+            return await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            return None
     
     # Creation of profile command
-    @commands.group(name="profile", invoke_without_command=True, aliases=["pf"])
+    @commands.group(name="profile", invoke_without_command=True, aliases=["pf"], brief="Get your profile info")
     async def profile(self, ctx, member: discord.Member = None):
         # Setting variable to get info about member
         member = member or ctx.author
 
+        # ctx.author and the converter already give a full member. Discord only sends presences
+        # with the presences intent, and only for cached members (slim profiles cache none)
+        has_presence = self.bot.intents.presences and (ctx.guild is None or ctx.guild.get_member(member.id) is not None)
+
         # Pre getting user profile description
-        member_bio = await self.bot.fetch_user(member.id)
+        member_bio = await self.users.get(member.id, self.fetch_user)
         
         # Trying to get users roles
         try: 
@@ -25,14 +45,14 @@ class Profile(commands.Cog):
         
         # Getting users status
         try:
-            status = str(member.status).title()
+            status = str(member.status).title() if has_presence else "Unknown"
         except AttributeError:
             status = "None"
         except Exception:
             status = "Error getting status!"
         
         try:
-            activity = member.activity
+            activity = member.activity if has_presence else "Unknown"
         except AttributeError:
             activity = "None"
         except Exception:
@@ -67,7 +87,7 @@ class Profile(commands.Cog):
 
         await ctx.send(embed=embed)
         
-    @profile.command(name="picture", aliases=["pic", "p", "pfp"])
+    @profile.command(name="picture", aliases=["pic", "p", "pfp"], brief="Get your profile picture")
     async def profile_picture(self, ctx, member: discord.Member = None):
         # Setting variable to get info about user
         member = member or ctx.author
@@ -7,12 +7,14 @@ import json
 
 # Create a cog class that inherits from commands.Cog.
 class Utility(commands.Cog):
+    help_category = "utility"
+
     def __init__(self, bot):
         self.bot = bot
 
     # This creates a command group named 'embed'.
     # It is a top-level command now, so we use @commands.group.
-    @commands.group(name='embed', invoke_without_command=True)
+    @commands.group(name='embed', invoke_without_command=True, extras={"help_name": "embed help"}, brief="Get help with embeds and embed builder")
     async def embed_commands(self, ctx):
         """A collection of commands for creating embeds."""
         embed = discord.Embed(
@@ -1,12 +1,17 @@
 import discord
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont
-import random
 import io
-import json
-import os
+import asyncio
+from functools import lru_cache
 from settings import WORDLE_WORDS, PREFIX
 from src.config.versions import WORDLE_VERSION
+from src.utils.embed_templates import templates
+from src.utils.game_store import GameStore, retry_on_conflict
+from src.utils.keyed_lock import KeyedLock
+from src.utils.render_pool import render_pool
+from src.utils.send_queue import HIGH
+from src.utils.word_bank import WordBank
+from src.utils.wordle_scoring import ABSENT, PRESENT, CORRECT, score, decode
 
 # Example 100 words
 WORDS = WORDLE_WORDS
@@ -18,7 +23,7 @@ CELL_SIZE = 60
 PADDING = 10
 KEY_SIZE = 40
 KEY_PADDING = 5
-SAVE_FILE = "src/games/wordle_games.json"
+IMAGE_CACHE_SIZE = 512  # Rendered boards kept in memory
 
 # Colors (as RGB tuples)
 BG_COLOR = (30, 30, 30)
@@ -27,66 +32,217 @@ FILL_COLOR = (50, 50, 50)  # Default cell color
 CORRECT_COLOR = (106, 170, 100)  # Green
 PRESENT_COLOR = (201, 180, 88)  # Yellow
 WRONG_COLOR = (120, 124, 126)  # Grey
+RESULT_COLORS = {ABSENT: WRONG_COLOR, PRESENT: PRESENT_COLOR, CORRECT: CORRECT_COLOR}
+
+
+@lru_cache(maxsize=None)
+def load_font(path, size):
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype(path, size)
+    except (OSError, IOError):
+        # Fallback to default system font if custom font isn't found
+        print(f"Warning: Font file not found at {path}. Using default font.")
+        return ImageFont.load_default()
+
+
+# --- Rendering ---
+MAX_ROWS = 6
+KEYBOARD_ROWS = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
+
+
+def layout(word_length):
+    """Image size and the top-left corner of every grid cell and key for one word length."""
+    grid_width = word_length * (CELL_SIZE + PADDING) + PADDING
+    grid_height = MAX_ROWS * (CELL_SIZE + PADDING) + PADDING
+    key_width = len(max(KEYBOARD_ROWS, key=len)) * (KEY_SIZE + KEY_PADDING) + KEY_PADDING
+    keyboard_height = len(KEYBOARD_ROWS) * (KEY_SIZE + KEY_PADDING) + KEY_PADDING
+
+    img_width = max(grid_width, key_width) + PADDING * 2
+    img_height = 50 + PADDING * 2 + grid_height + keyboard_height + PADDING * 2
+
+    grid_start_y = 50 + PADDING * 2
+    grid_start_x = (img_width - grid_width) / 2
+    cells = [
+        [(int(grid_start_x + PADDING + col * (CELL_SIZE + PADDING)), grid_start_y + PADDING + row * (CELL_SIZE + PADDING))
+         for col in range(word_length)]
+        for row in range(MAX_ROWS)
+    ]
+
+    keyboard_start_y = grid_start_y + grid_height + PADDING
+    keys = {}
+    for r_idx, row_keys in enumerate(KEYBOARD_ROWS):
+        row_width = len(row_keys) * (KEY_SIZE + KEY_PADDING) - KEY_PADDING
+        start_x = (img_width - row_width) / 2
+        for k_idx, key in enumerate(row_keys):
+            keys[key] = (int(start_x + k_idx * (KEY_SIZE + KEY_PADDING)), keyboard_start_y + r_idx * (KEY_SIZE + KEY_PADDING))
+
+    return (img_width, img_height), cells, keys
+
+
+@lru_cache(maxsize=None)
+def tile(letter, fill_color, size, border):
+    """
+    One grid cell or key, drawn once per letter and colour.
+    Unbounded on purpose, WordBank.is_valid only lets a-z guesses through so there are at most a few hundred.
+    """
+    from PIL import Image, ImageDraw
+    image = Image.new("RGB", (size + 1, size + 1), BG_COLOR)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, size, size], outline=OUTLINE_COLOR, width=border, fill=fill_color)
+    if letter:
+        font = load_font(FONT_PATH, 40 if size == CELL_SIZE else 20)
+        bbox = draw.textbbox((0, 0), letter, font=font)
+        w = bbox[2] - bbox[0]
+        h = bbox[3] - bbox[1]
+        draw.text(((size - w) / 2, (size - h) / 2), letter, font=font, fill=OUTLINE_COLOR)
+    return image
+
+
+@lru_cache(maxsize=None)
+def empty_board(word_length):
+    """Background with an empty guess grid, shared by every game with this word length."""
+    from PIL import Image
+    size, cells, _ = layout(word_length)
+    image = Image.new("RGB", size, color=BG_COLOR)
+    empty = tile("", FILL_COLOR, CELL_SIZE, 3)
+    for row in cells:
+        for position in row:
+            image.paste(empty, position)
+    return image
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def render_state(word_length, rows):
+    """
+    PNG bytes for one visual state, rows are (guess, pattern) pairs.
+    Identical boards (like every empty start board) are only rendered once.
+    """
+    from PIL import ImageDraw
+    image = empty_board(word_length).copy()
+    _, cells, key_positions = layout(word_length)
+    draw = ImageDraw.Draw(image)
+
+    # Draw score at the top
+    score_font = load_font(FONT_PATH, 25)
+    score_text = f"Attempts: {len(rows)}/6"
+    bbox = draw.textbbox((0, 0), score_text, font=score_font)
+    draw.text(((image.width - bbox[2]) / 2, PADDING), score_text, font=score_font, fill=OUTLINE_COLOR)
+
+    # Only the guessed cells differ from the empty grid, keys show the best result of their letter
+    best = {}
+    for row, (guess, pattern) in enumerate(rows):
+        for col, (letter, result) in enumerate(zip(guess, decode(pattern, word_length))):
+            image.paste(tile(letter.upper(), RESULT_COLORS[result], CELL_SIZE, 3), cells[row][col])
+            best[letter.upper()] = max(best.get(letter.upper(), ABSENT), result)
+
+    for key, position in key_positions.items():
+        image.paste(tile(key, RESULT_COLORS[best.get(key, ABSENT)], KEY_SIZE, 2), position)
+
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def render_wordle(word_length, guesses, patterns):
+    """Render the guess grid and keyboard for one game, returns the PNG in a buffer."""
+    return io.BytesIO(render_state(word_length, tuple(zip(guesses, patterns))))
+
+
+# --- Save / Load ---
+def decode_game(game):
+    # Games saved before patterns were stored get them computed once
+    if "patterns" not in game:
+        game["patterns"] = [score(guess, game["word"]) for guess in game["guesses"]]
+    return game
+
+
+def help_embed():
+    embed = discord.Embed(
+        title="Wordle 🟩 🟨 ⬜ | Help",
+        description=f"Use `{PREFIX}wordle start <length>` to start a game or `{PREFIX}wordle stop` to stop your game.\n\nStart playing wordle now with these commands!:",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name=f"`{PREFIX}wordle` or `{PREFIX}wordle help`", value="Shows this message!", inline=False)
+    embed.add_field(name=f"`{PREFIX}wordle start <length>`", value=f"Starts a new game with a word of a specified length (default 5).", inline=False)
+    embed.add_field(name=f"`{PREFIX}wordle stop`", value=f"Stops your current game.", inline=False)
+    embed.set_footer(text=f"Version: {WORDLE_VERSION}")
+    return embed
+
+
+templates.register("wordle help", help_embed)
+
 
 class Wordle(commands.Cog):
+    help_category = "fun"
+
     def __init__(self, bot):
         self.bot = bot
-        self.active_games = self.load_games()
-        self.font = self.load_font(FONT_PATH, 40)
-        self.key_font = self.load_font(FONT_PATH, 20)
-        self.score_font = self.load_font(FONT_PATH, 25)
-
-    def load_font(self, path, size):
-        try:
-            return ImageFont.truetype(path, size)
-        except (OSError, IOError):
-            # Fallback to default system font if custom font isn't found
-            print(f"Warning: Font file not found at {path}. Using default font.")
-            return ImageFont.load_default()
-
-    # --- Save / Load ---
-    def save_games(self):
-        with open(SAVE_FILE, "w") as f:
-            json.dump(self.active_games, f)
-
-    def load_games(self):
-        if os.path.exists(SAVE_FILE):
-            with open(SAVE_FILE, "r") as f:
-                data = json.load(f)
-                return {int(k): v for k, v in data.items()}
-        return {}
-
-    @commands.group(name="wordle", invoke_without_command=True)
+        self.active_games = GameStore("wordle_games", key_type=int, decode=decode_game)
+        self.words = WordBank(WORDS)
+        self.locks = KeyedLock()
+
+        # Routing for on_message: channel id -> ids of players with a game there.
+        # Games restored from disk don't know their channel until first loaded.
+        self.channel_players = {}
+        self.player_channel = {}
+        self.unrouted = set()
+
+    async def cog_load(self):
+        await self.active_games.open()
+        await asyncio.to_thread(self.words.load)
+        self.unrouted = set(self.active_games.ids)
+
+    def route(self, user_id, channel_id):
+        self.unroute(user_id)
+        self.channel_players.setdefault(channel_id, set()).add(user_id)
+        self.player_channel[user_id] = channel_id
+
+    def unroute(self, user_id):
+        self.unrouted.discard(user_id)
+        channel_id = self.player_channel.pop(user_id, None)
+        players = self.channel_players.get(channel_id)
+        if players is not None:
+            players.discard(user_id)
+            if not players:
+                del self.channel_players[channel_id]
+
+    def end_game(self, user_id):
+        self.active_games.delete(user_id)
+        self.unroute(user_id)
+
+    async def cog_unload(self):
+        await self.active_games.close()
+
+    @commands.group(name="wordle", invoke_without_command=True, extras={"help_name": "wordle help"}, brief="Play wordle game")
     async def wordle_group(self, ctx):
-        embed = discord.Embed(
-            title="Wordle 🟩 🟨 ⬜ | Help",
-            description=f"Use `{PREFIX}wordle start <length>` to start a game or `{PREFIX}wordle stop` to stop your game.\n\nStart playing wordle now with these commands!:",
-            color=discord.Color.blue()
-        )
-        embed.add_field(name=f"`{PREFIX}wordle` or `{PREFIX}wordle help`", value="Shows this message!", inline=False)
-        embed.add_field(name=f"`{PREFIX}wordle start <length>`", value=f"Starts a new game with a word of a specified length (default 5).", inline=False)
-        embed.add_field(name=f"`{PREFIX}wordle stop`", value=f"Stops your current game.", inline=False)
-        embed.set_footer(text=f"Version: {WORDLE_VERSION}")
-        await ctx.send(embed=embed)
+        await ctx.send(embed=templates.get("wordle help"))
 
     @wordle_group.command(name="start")
     async def start_wordle(self, ctx, length: int = 5):
         if length < 3 or length > 10:
             return await ctx.send("Word length must be between 3 and 10 letters.")
-        if ctx.author.id in self.active_games:
+        async with self.locks(ctx.author.id):
+            await retry_on_conflict(lambda: self.create_game(ctx, length))
+
+    async def create_game(self, ctx, length):
+        # get() instead of `in`, in cluster mode the game may have been started on another shard
+        if await self.active_games.get(ctx.author.id) is not None:
             return await ctx.send("You already have an active game! Type `!stopwordle` to end it.")
 
-        possible_words = [w for w in WORDS if len(w) == length]
-        if not possible_words:
+        word = self.words.random_word(length)
+        if not word:
             return await ctx.send(f"No words available for a length of {length}.")
-        word = random.choice(possible_words).lower()
 
-        self.active_games[ctx.author.id] = {
+        game = {
             "word": word,
             "guesses": [],
-            "current_guess": ""
+            "patterns": [],
+            "current_guess": "",
+            "channel_id": ctx.channel.id
         }
-        self.save_games()
+        await self.active_games.save(ctx.author.id, game)
+        self.route(ctx.author.id, ctx.channel.id)
 
         embed = discord.Embed(
             title=f"Wordle 🟩 🟨 ⬜ ({length} letters)",
@@ -94,44 +250,63 @@ class Wordle(commands.Cog):
             color=discord.Color.green()
         )
         embed.set_footer(text=f"Version: {WORDLE_VERSION}")
-        img_file = self.generate_image(ctx.author.id)
+        img_file = await self.generate_image(game)
         embed.set_image(url="attachment://wordle.png")
         await ctx.send(embed=embed, file=img_file)
 
     @wordle_group.command(name="stop")
     async def stop_wordle(self, ctx):
-        if ctx.author.id not in self.active_games:
-            return await ctx.send("You have no active game.")
-        word = self.active_games[ctx.author.id]["word"]
-        del self.active_games[ctx.author.id]
-        self.save_games()
+        async with self.locks(ctx.author.id):
+            game = await self.active_games.get(ctx.author.id)
+            if game is None:
+                return await ctx.send("You have no active game.")
+            self.end_game(ctx.author.id)
+        word = game["word"]
         await ctx.send(f"Wordle game stopped. The word was `{word}`.")
 
     @commands.Cog.listener()
     async def on_message(self, message):
+        # Runs for every message the bot sees, only set lookups before anything else
+        user_id = message.author.id
+        players = self.channel_players.get(message.channel.id)
+        if not (players and user_id in players) and user_id not in self.unrouted:
+            return
         if message.author.bot or not message.content.startswith("!"):
             return
-        
-        guess = message.content[1:].lower()
-        user_id = message.author.id
 
-        if user_id not in self.active_games:
-            return
+        # Guesses of one player are handled one after another, so a fast double send
+        # can't both pass the guess limit or both end the game. In cluster mode a guess
+        # racing one on another shard is redone on the saved game
+        async with self.locks(user_id):
+            await retry_on_conflict(lambda: self.handle_guess(message, user_id))
+
+    async def handle_guess(self, message, user_id):
+        game = await self.active_games.get(user_id)
+        if game is None:
+            return self.unroute(user_id)
+        if user_id in self.unrouted:
+            # First message since a restart, games saved without a channel move to this one
+            self.route(user_id, game.setdefault("channel_id", message.channel.id))
+            if game["channel_id"] != message.channel.id:
+                return
 
-        game = self.active_games[user_id]
+        guess = message.content[1:].lower()
         word = game["word"]
 
         if len(guess) != len(word):
-            await message.channel.send(f"Your guess must be {len(word)} letters long.")
+            await self.bot.send_queue.send(message.channel, priority=HIGH, content=f"Your guess must be {len(word)} letters long.")
+            return
+        if not self.words.is_valid(guess):
+            await self.bot.send_queue.send(message.channel, priority=HIGH, content=f"`{guess}` is not in the word list.")
             return
         if len(game["guesses"]) >= 6:
-            await message.channel.send(f"You've already used all your guesses! The word was `{word}`.")
-            del self.active_games[user_id]
-            self.save_games()
+            await self.bot.send_queue.send(message.channel, priority=HIGH, content=f"You've already used all your guesses! The word was `{word}`.")
+            self.end_game(user_id)
             return
         
         game["guesses"].append(guess)
-        self.save_games()
+        game["patterns"].append(score(guess, word))
+        await self.active_games.save(user_id, game)
 
         # Check if the guess is correct
         if guess == word:
@@ -141,11 +316,10 @@ class Wordle(commands.Cog):
                 color=discord.Color.green()
             )
             embed.set_footer(text=f"Version: {WORDLE_VERSION}")
-            img_file = self.generate_image(user_id)
+            img_file = await self.generate_image(game)
             embed.set_image(url="attachment://wordle.png")
-            await message.channel.send(embed=embed, file=img_file)
-            del self.active_games[user_id]
-            self.save_games()
+            await self.bot.send_queue.send(message.channel, priority=HIGH, embed=embed, file=img_file)
+            self.end_game(user_id)
             return
 
         # Check if max guesses have been reached
@@ -156,11 +330,10 @@ class Wordle(commands.Cog):
                 color=discord.Color.red()
             )
             embed.set_footer(text=f"Version: {WORDLE_VERSION}")
-            img_file = self.generate_image(user_id)
+            img_file = await self.generate_image(game)
             embed.set_image(url="attachment://wordle.png")
-            await message.channel.send(embed=embed, file=img_file)
-            del self.active_games[user_id]
-            self.save_games()
+            await self.bot.send_queue.send(message.channel, priority=HIGH, embed=embed, file=img_file)
+            self.end_game(user_id)
             return
 
         # Normal update for an incorrect guess
@@ -170,103 +343,12 @@ class Wordle(commands.Cog):
             color=discord.Color.green()
         )
         embed.set_footer(text=f"Version: {WORDLE_VERSION}")
-        img_file = self.generate_image(user_id)
+        img_file = await self.generate_image(game)
         embed.set_image(url="attachment://wordle.png")
-        await message.channel.send(embed=embed, file=img_file)
-
-    def generate_image(self, user_id):
-        game = self.active_games[user_id]
-        guesses = game["guesses"]
-        word = game["word"]
-        word_length = len(word)
-        max_rows = 6
+        await self.bot.send_queue.send(message.channel, priority=HIGH, embed=embed, file=img_file)
 
-        # Calculate image dimensions based on content
-        grid_width = word_length * (CELL_SIZE + PADDING) + PADDING
-        grid_height = max_rows * (CELL_SIZE + PADDING) + PADDING
-        
-        # Keyboard layout
-        keyboard_rows = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
-        key_width = len(max(keyboard_rows, key=len)) * (KEY_SIZE + KEY_PADDING) + KEY_PADDING
-        keyboard_height = len(keyboard_rows) * (KEY_SIZE + KEY_PADDING) + KEY_PADDING
-
-        # Total image dimensions
-        img_width = max(grid_width, key_width) + PADDING * 2
-        img_height = 50 + PADDING * 2 + grid_height + keyboard_height + PADDING * 2
-
-        image = Image.new("RGB", (img_width, img_height), color=BG_COLOR)
-        draw = ImageDraw.Draw(image)
-
-        # Draw score at the top
-        score_text = f"Attempts: {len(guesses)}/6"
-        bbox = draw.textbbox((0, 0), score_text, font=self.score_font)
-        draw.text(((img_width - bbox[2]) / 2, PADDING), score_text, font=self.score_font, fill=OUTLINE_COLOR)
-
-        # Draw guesses grid
-        grid_start_y = 50 + PADDING * 2
-        grid_start_x = (img_width - grid_width) / 2
-        for row in range(max_rows):
-            for col in range(word_length):
-                x0 = grid_start_x + PADDING + col * (CELL_SIZE + PADDING)
-                y0 = grid_start_y + PADDING + row * (CELL_SIZE + PADDING)
-                x1 = x0 + CELL_SIZE
-                y1 = y0 + CELL_SIZE
-                
-                fill_color = FILL_COLOR
-                letter = ""
-
-                if row < len(guesses):
-                    guess_word = guesses[row]
-                    letter = guess_word[col]
-                    if letter == word[col]:
-                        fill_color = CORRECT_COLOR
-                    elif letter in word:
-                        fill_color = PRESENT_COLOR
-                    else:
-                        fill_color = WRONG_COLOR
-                
-                draw.rectangle([x0, y0, x1, y1], outline=OUTLINE_COLOR, width=3, fill=fill_color)
-                if letter:
-                    bbox = draw.textbbox((0, 0), letter.upper(), font=self.font)
-                    w = bbox[2] - bbox[0]
-                    h = bbox[3] - bbox[1]
-                    draw.text((x0 + (CELL_SIZE - w) / 2, y0 + (CELL_SIZE - h) / 2), letter.upper(), font=self.font, fill=OUTLINE_COLOR)
-
-        # Draw keyboard
-        key_colors = {k: WRONG_COLOR for k in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"}
-        for guess in guesses:
-            temp_word = list(word) # Use a temp list to handle duplicate letters
-            for i, letter in enumerate(guess):
-                if letter == word[i]:
-                    key_colors[letter.upper()] = CORRECT_COLOR
-                    if letter in temp_word:
-                        temp_word.remove(letter)
-
-        for guess in guesses:
-            for i, letter in enumerate(guess):
-                if letter in temp_word and key_colors[letter.upper()] != CORRECT_COLOR:
-                    key_colors[letter.upper()] = PRESENT_COLOR
-                    if letter in temp_word:
-                        temp_word.remove(letter)
-        
-        keyboard_start_y = grid_start_y + grid_height + PADDING
-        for r_idx, row_keys in enumerate(keyboard_rows):
-            row_width = len(row_keys) * (KEY_SIZE + KEY_PADDING) - KEY_PADDING
-            start_x = (img_width - row_width) / 2
-            for k_idx, key in enumerate(row_keys):
-                x0 = start_x + k_idx * (KEY_SIZE + KEY_PADDING)
-                y0 = keyboard_start_y + r_idx * (KEY_SIZE + KEY_PADDING)
-                x1 = x0 + KEY_SIZE
-                y1 = y0 + KEY_SIZE
-                draw.rectangle([x0, y0, x1, y1], fill=key_colors[key], outline=OUTLINE_COLOR, width=2)
-                bbox = draw.textbbox((0, 0), key, font=self.key_font)
-                w = bbox[2] - bbox[0]
-                h = bbox[3] - bbox[1]
-                draw.text((x0 + (KEY_SIZE - w) / 2, y0 + (KEY_SIZE - h) / 2), key, font=self.key_font, fill=OUTLINE_COLOR)
-
-        buffer = io.BytesIO()
-        image.save(buffer, "PNG")
-        buffer.seek(0)
+    async def generate_image(self, game):
+        buffer = await render_pool.run(render_wordle, len(game["word"]), list(game["guesses"]), list(game["patterns"]))
         return discord.File(fp=buffer, filename="wordle.png")
 
 async def setup(bot):
@@ -0,0 +1,58 @@
+# Process setup shared by main.py and launcher.py: the discord.bot logger and the bot token.
+import os
+import logging
+from colorama import Fore, Style, init
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Initialize colorama
+init(autoreset=True)
+
+# Discord-style console formatter with bold timestamp and level
+class DiscordStyledFormatter(logging.Formatter):
+    LEVEL_COLORS = {
+        "DEBUG": Fore.CYAN + Style.BRIGHT,
+        "INFO": Fore.BLUE + Style.BRIGHT,
+        "WARNING": Fore.YELLOW + Style.BRIGHT,
+        "ERROR": Fore.RED + Style.BRIGHT,
+        "CRITICAL": Fore.RED + Style.BRIGHT,
+    }
+    LOGGER_COLOR = Fore.MAGENTA
+    TIME_COLOR = Fore.LIGHTBLACK_EX + Style.BRIGHT
+    MESSAGE_COLOR = Fore.WHITE
+
+    def format(self, record):
+        time_str = f"{self.TIME_COLOR}{self.formatTime(record, '%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}"
+        level_str = f"{self.LEVEL_COLORS.get(record.levelname,'')}{record.levelname:<8}{Style.RESET_ALL}"
+        logger_name = f"{self.LOGGER_COLOR}{record.name}{Style.RESET_ALL}"
+        message = f"{self.MESSAGE_COLOR}{record.getMessage()}{Style.RESET_ALL}"
+        return f"{time_str} {level_str} {logger_name} {message}"
+
+# Create discord.bot logger
+logger = logging.getLogger("discord.bot")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+if not logger.handlers:
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(DiscordStyledFormatter())
+    logger.addHandler(console_handler)
+
+    # File handler with new log each time
+    now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    log_dir = "src/logs"
+    os.makedirs(log_dir, exist_ok=True)  # Ensure folder exists
+    log_file = os.path.join(log_dir, f"BOT_{now}.log")
+
+    file_handler = logging.FileHandler(log_file, encoding="utf-8", mode="w")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)-8s %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    ))
+    logger.addHandler(file_handler)
+
+load_dotenv()
+TOKEN = os.getenv("token", 'Please make .env file with toke="YOUR_TOKEN"')
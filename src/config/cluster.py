@@ -0,0 +1,16 @@
+import os
+
+# ================= CONFIG =================
+AUTO_SHARD = False            # One process running every shard Discord recommends (AutoShardedBot)
+CLUSTERS = 2                  # Worker processes started by launcher.py, each runs a range of shards
+TOTAL_SHARDS = None           # Shards across all workers, None uses Discord's recommendation
+IPC_HOST = "127.0.0.1"        # launcher.py listens here for its workers
+IPC_PORT = 47820
+# ==========================================
+
+# Set by launcher.py for every worker it starts, unset when main.py runs on its own
+CLUSTER_ID = int(os.getenv("NEXUS_CLUSTER_ID", "0"))
+SHARD_IDS = [int(shard) for shard in os.getenv("NEXUS_SHARD_IDS", "").split(",") if shard]
+SHARD_COUNT = int(os.getenv("NEXUS_SHARD_COUNT", "0")) or None
+IPC_SECRET = os.getenv("NEXUS_IPC_SECRET")
+CLUSTERED = bool(SHARD_IDS)
@@ -0,0 +1,51 @@
+import discord
+
+# ================= CONFIG =================
+INTENTS_PROFILE = "slim"      # "full", "balanced" or "slim", see PROFILES and bench/intents_memory.py
+# ==========================================
+
+# Every cog answers prefix commands
+BASE_INTENTS = ("guilds", "guild_messages", "dm_messages", "message_content")
+
+# What a cog needs on top of the base. Optional intents only make its output richer,
+# e.g. the profile command shows status and activity only with presences.
+COG_INTENTS = {
+    "pf": {"required": (), "optional": ("members", "presences")},
+}
+
+PROFILES = {
+    # Every intent and every member of every guild cached at startup
+    "full": {"all_intents": True, "optional": True, "member_cache": "all", "chunk": True},
+    # Intents of the loaded cogs with the optional ones, members cached as they show up.
+    # Opt-in, presences bring an update for every status or activity change of every member.
+    "balanced": {"all_intents": False, "optional": True, "member_cache": "intents", "chunk": False},
+    # Only intents the loaded cogs can't work without and no member cache, commands use the member the message brings
+    "slim": {"all_intents": False, "optional": False, "member_cache": "none", "chunk": False},
+}
+
+
+def build(cogs, profile=INTENTS_PROFILE):
+    """Intents, member cache flags and whether to chunk guilds at startup for these cog names."""
+    settings = PROFILES[profile]
+    if settings["all_intents"]:
+        intents = discord.Intents.all()
+    else:
+        names = set(BASE_INTENTS)
+        for cog in cogs:
+            needs = COG_INTENTS.get(cog, {})
+            names.update(needs.get("required", ()))
+            if settings["optional"]:
+                names.update(needs.get("optional", ()))
+        intents = discord.Intents.none()
+        for name in names:
+            setattr(intents, name, True)
+
+    if settings["member_cache"] == "all":
+        member_cache_flags = discord.MemberCacheFlags.all()
+    elif settings["member_cache"] == "intents":
+        member_cache_flags = discord.MemberCacheFlags.from_intents(intents)
+    else:
+        member_cache_flags = discord.MemberCacheFlags.none()
+
+    # Chunking needs the members intent
+    return intents, member_cache_flags, settings["chunk"] and intents.members
@@ -1,6 +1,6 @@
 # Commands
-WORDLE_VERSION = "1.1.2"
-MAZE_VERSION = "1.2.1"
+WORDLE_VERSION = "1.2.0"
+MAZE_VERSION = "1.3.0"
 
 # Bot
 BOT_VERSION = "2.4.0"
\ No newline at end of file
@@ -0,0 +1,59 @@
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+ZLIB_HEADER = b"\x78\x01"     # Deflate, 32K window, no preset dictionary
+FINAL_BLOCK = b"\x03\x00"     # Empty last deflate block, closes the stream after the bands
+ADLER_BASE = 65521
+
+
+def adler32_combine(adler1, adler2, length2):
+    """Adler-32 of two joined pieces of data from the checksums of each, like zlib's adler32_combine()."""
+    rem = length2 % ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = rem * sum1 % ADLER_BASE
+    sum1 = (sum1 + (adler2 & 0xFFFF) + ADLER_BASE - 1) % ADLER_BASE
+    sum2 = (sum2 + (adler1 >> 16) + (adler2 >> 16) + ADLER_BASE - rem) % ADLER_BASE
+    return sum1 | sum2 << 16
+
+
+def chunk(kind, data):
+    return len(data).to_bytes(4, "big") + kind + data + zlib.crc32(kind + data).to_bytes(4, "big")
+
+
+class BandedPNG:
+    """
+    PNG encoder for a palette image that keeps the compressed pixel data per band of rows.
+    Every band is deflated on its own and ends on a full flush, so the bands simply join
+    into one valid zlib stream and update() only recompresses the bands whose rows changed.
+    Building the file then costs one copy of the compressed bands instead of a new encode.
+    """
+
+    def __init__(self, image, band_height, compress_level=1):
+        self.width, self.height = image.size
+        self.band_height = band_height
+        self.compress_level = compress_level
+        ihdr = self.width.to_bytes(4, "big") + self.height.to_bytes(4, "big") + bytes((8, 3, 0, 0, 0))
+        self.header = PNG_SIGNATURE + chunk(b"IHDR", ihdr) + chunk(b"PLTE", bytes(image.getpalette()))
+        self.bands = [self._compress(image, top) for top in range(0, self.height, band_height)]
+
+    def update(self, image, top, bottom):
+        """Recompress the bands holding pixel rows [top, bottom) of image."""
+        for band in range(top // self.band_height, (bottom - 1) // self.band_height + 1):
+            self.bands[band] = self._compress(image, band * self.band_height)
+
+    def _compress(self, image, top):
+        """(deflated rows, their Adler-32, their length) for the band starting at pixel row top."""
+        bottom = min(top + self.band_height, self.height)
+        pixels = image.crop((0, top, self.width, bottom)).tobytes()
+        # Every scanline starts with its filter type, 0 = none
+        width = self.width
+        rows = b"".join(b"\x00" + pixels[i:i + width] for i in range(0, len(pixels), width))
+        deflate = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        return deflate.compress(rows) + deflate.flush(zlib.Z_FULL_FLUSH), zlib.adler32(rows), len(rows)
+
+    def png(self):
+        adler = 1  # Adler-32 of no data
+        for _, band_adler, length in self.bands:
+            adler = adler32_combine(adler, band_adler, length)
+        data = ZLIB_HEADER + b"".join(band for band, _, _ in self.bands) + FINAL_BLOCK + adler.to_bytes(4, "big")
+        return self.header + chunk(b"IDAT", data) + chunk(b"IEND", b"")
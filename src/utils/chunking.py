@@ -0,0 +1,51 @@
+# Pack many results into as few Discord messages as the limits allow.
+
+# ================= CONFIG =================
+MAX_EMBEDS = 10               # Embeds per message
+MAX_EMBED_CHARS = 6000        # Characters across all embeds of one message
+MAX_MESSAGE_CHARS = 2000      # Characters of message content
+# ==========================================
+
+
+def chunk_embeds(embeds, max_embeds=MAX_EMBEDS, max_chars=MAX_EMBED_CHARS):
+    """Split embeds into groups that each fit in one message."""
+    chunks, chunk, chars = [], [], 0
+    for embed in embeds:
+        size = len(embed)
+        if chunk and (len(chunk) == max_embeds or chars + size > max_chars):
+            chunks.append(chunk)
+            chunk, chars = [], 0
+        chunk.append(embed)
+        chars += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def chunk_text(parts, separator="\n\n", limit=MAX_MESSAGE_CHARS):
+    """Join parts into as few messages as fit in limit, a part too long on its own is cut up."""
+    chunks, chunk = [], ""
+    for part in parts:
+        while len(part) > limit:
+            if chunk:
+                chunks.append(chunk)
+                chunk = ""
+            chunks.append(part[:limit])
+            part = part[limit:]
+        if chunk and len(chunk) + len(separator) + len(part) > limit:
+            chunks.append(chunk)
+            chunk = ""
+        chunk = chunk + separator + part if chunk else part
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+async def send_embeds(destination, embeds):
+    """Send embeds with one message per chunk, returns the sent messages."""
+    return [await destination.send(embeds=chunk) for chunk in chunk_embeds(embeds)]
+
+
+async def send_text(destination, parts, separator="\n\n"):
+    """Send text parts with one message per chunk, returns the sent messages."""
+    return [await destination.send(chunk) for chunk in chunk_text(parts, separator)]
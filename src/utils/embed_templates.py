@@ -0,0 +1,36 @@
+import copy
+
+import discord
+
+
+class EmbedTemplates:
+    """
+    Static embeds (help pages and the like) built once when their module loads.
+    get() hands out the shared embed, which is only ever serialized by send,
+    so it must not be changed. Use copy() for one to change (e.g. add a footer).
+    """
+
+    def __init__(self):
+        self.embeds = {}  # name -> one embed or a list of embeds
+
+    def register(self, name, build):
+        """Build the template now, build() returns an Embed or a list of them."""
+        built = build()
+        self.embeds[name] = built if isinstance(built, discord.Embed) else list(built)
+
+    def __contains__(self, name):
+        return name in self.embeds
+
+    def get(self, name):
+        return self.embeds[name]
+
+    def copy(self, name):
+        # Embed.copy() shares the field list with the original, copy the payload itself
+        embeds = self.embeds[name]
+        if isinstance(embeds, discord.Embed):
+            return discord.Embed.from_dict(copy.deepcopy(embeds.to_dict()))
+        return [discord.Embed.from_dict(copy.deepcopy(embed.to_dict())) for embed in embeds]
+
+
+# Shared by every cog
+templates = EmbedTemplates()
@@ -0,0 +1,447 @@
+import os
+import json
+import sqlite3
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+
+from src.config.cluster import CLUSTERED
+
+# ================= CONFIG =================
+BACKEND = "sqlite"            # "sqlite" or "journal"
+DATABASE_FILE = "src/games/games.db"
+COMPACT_EVERY = 500           # Journal records before folding them into the snapshot
+CACHE_SIZE = 1000             # Games kept in memory per store
+FLUSH_DELAY = 0.25            # Seconds changes are collected before one write
+FLUSH_RETRY_DELAY = 1.0       # Seconds before a failed write is tried again, doubled every failure
+FLUSH_RETRY_MAX = 30
+CONFLICT_RETRIES = 5          # Times a change is redone when another process saved the same game first
+SHARED = CLUSTERED            # Other processes write to the same database, read games through on every get
+# ==========================================
+
+logger = logging.getLogger("discord.bot")
+
+
+class GameConflict(Exception):
+    """Another process saved the game since this one read it."""
+
+
+# --- Backends ---
+# Backends are blocking and are only called from worker threads.
+# They store every game as JSON text keyed by a string.
+class JournalBackend:
+    """
+    Game state saved as a JSON snapshot plus an append-only journal.
+    Every change appends one small record instead of rewriting the whole file,
+    the journal is folded back into the snapshot every COMPACT_EVERY records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + ".journal"
+        self.games = {}
+        self.records = 0
+        self.lock = threading.Lock()
+        self._journal = None
+
+    def open(self):
+        """Read the snapshot and replay the journal on top of it."""
+        games = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                games = json.load(f)
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash, everything before it is still valid
+                        break
+                    if record.get("d"):
+                        games.pop(record["k"], None)
+                    else:
+                        games[record["k"]] = record["v"]
+
+        self.games = {k: json.dumps(v) for k, v in games.items()}
+        self.compact()
+
+    def keys(self):
+        return list(self.games)
+
+    def get(self, key):
+        return self.games.get(key)
+
+    def write_batch(self, changes):
+        """Append one record per changed game, None as text means the game was removed."""
+        lines = []
+        with self.lock:
+            for key, text in changes.items():
+                if text is None:
+                    self.games.pop(key, None)
+                    lines.append('{"k": %s, "d": true}\n' % json.dumps(key))
+                else:
+                    self.games[key] = text
+                    lines.append('{"k": %s, "v": %s}\n' % (json.dumps(key), text))
+
+            self._journal.write("".join(lines))
+            self._journal.flush()
+
+            self.records += len(lines)
+            if self.records >= COMPACT_EVERY:
+                self.compact()
+
+    def compact(self):
+        """Write all games to a fresh snapshot and start an empty journal."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write("{" + ", ".join(f"{json.dumps(k)}: {v}" for k, v in self.games.items()) + "}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, "w")
+        self.records = 0
+
+    def close(self):
+        with self.lock:
+            if self._journal is not None:
+                self.compact()
+                self._journal.close()
+                self._journal = None
+
+
+class SQLiteBackend:
+    """
+    One row per game in a shared SQLite database running in WAL mode.
+    Every write bumps the row's version, so processes sharing the database
+    can tell whether a game changed since they read it.
+    """
+
+    def __init__(self, path, table, legacy_path=None):
+        self.path = path
+        self.table = table
+        self.legacy_path = legacy_path
+        self.lock = threading.Lock()
+        self.db = None
+
+    def open(self):
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+
+        exists = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table,)
+        ).fetchone()
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, data TEXT NOT NULL, version INTEGER NOT NULL DEFAULT 0)"
+        )
+        if exists and "version" not in {row[1] for row in self.db.execute(f"PRAGMA table_info({self.table})")}:
+            # Table from before versioned writes
+            try:
+                self.db.execute(f"ALTER TABLE {self.table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass  # Another process added it first
+
+        # First run on this table, import games from the old JSON save
+        if not exists and self.legacy_path and os.path.exists(self.legacy_path):
+            legacy = JournalBackend(self.legacy_path)
+            legacy.open()
+            with self.db:
+                self.db.executemany(f"INSERT OR REPLACE INTO {self.table} (key, data) VALUES (?, ?)", legacy.games.items())
+            legacy.close()
+
+    def keys(self):
+        with self.lock:
+            return [row[0] for row in self.db.execute(f"SELECT key FROM {self.table}")]
+
+    def get(self, key):
+        row = self.get_versioned(key)
+        return row[0] if row else None
+
+    def get_versioned(self, key):
+        """(text, version) of the game or None."""
+        with self.lock:
+            return self.db.execute(f"SELECT data, version FROM {self.table} WHERE key = ?", (key,)).fetchone()
+
+    def write_batch(self, changes, versions=None):
+        """
+        Write all changed games in one transaction, None as text means the game was removed.
+        With versions (key -> version last read, None for a new game) a game is only written
+        if nobody saved it since. Returns key -> new version then, None for every conflict.
+        """
+        with self.lock, self.db:
+            self.db.executemany(
+                f"DELETE FROM {self.table} WHERE key = ?",
+                [(k,) for k, v in changes.items() if v is None]
+            )
+            if versions is None:
+                self.db.executemany(
+                    f"INSERT INTO {self.table} (key, data) VALUES (?, ?) "
+                    f"ON CONFLICT(key) DO UPDATE SET data = excluded.data, version = version + 1",
+                    [(k, v) for k, v in changes.items() if v is not None]
+                )
+                return {}
+
+            written = {}
+            for key, text in changes.items():
+                if text is None:
+                    continue
+                version = versions.get(key)
+                if version is None:
+                    cursor = self.db.execute(f"INSERT OR IGNORE INTO {self.table} (key, data) VALUES (?, ?)", (key, text))
+                    written[key] = 0 if cursor.rowcount else None
+                else:
+                    cursor = self.db.execute(
+                        f"UPDATE {self.table} SET data = ?, version = version + 1 WHERE key = ? AND version = ?",
+                        (text, key, version)
+                    )
+                    written[key] = version + 1 if cursor.rowcount else None
+            return written
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+
+# --- Store ---
+class GameStore:
+    """
+    Async front for a backend. Only the ids of saved games are kept up front,
+    a game is read from the backend the first time it is touched and then
+    cached (LRU bounded by CACHE_SIZE).
+
+    Changes are write-behind: put/delete only mark the game dirty and every
+    change made within FLUSH_DELAY is written in one batch off the event loop.
+
+    A shared store (cluster mode, several processes on one SQLite database)
+    re-reads a game on every get unless it has unsaved local changes, writes
+    right away and only treats `in` as a hint, so callers check get() for None.
+    Its writes only go through if the game's version is still the one it read,
+    save() raises GameConflict otherwise and retry_on_conflict() redoes the change.
+    """
+
+    def __init__(self, name, key_type=str, encode=None, decode=None, shared=SHARED):
+        self.name = name
+        self.key_type = key_type
+        # Convert a game to and from its JSON form, for games holding custom objects
+        self.encode = encode or (lambda game: game)
+        self.decode = decode or (lambda game: game)
+        self.ids = set()
+        self.cache = OrderedDict()
+        self.dirty = {}
+        self.saving = {}  # Batch being written right now
+        self.shared = shared
+        self.versions = {}     # Shared stores: key -> version of the game last read or written
+        self.conflicts = set()  # Keys whose last write lost to another process
+        self.flush_delay = 0 if shared else FLUSH_DELAY
+        self.failures = 0      # Failed flushes in a row
+        self.closed = False
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+
+        legacy_path = f"src/games/{name}.json"
+        if BACKEND == "sqlite" or shared:
+            self.backend = SQLiteBackend(DATABASE_FILE, name, legacy_path=legacy_path)
+        else:
+            self.backend = JournalBackend(legacy_path)
+
+    async def open(self):
+        await asyncio.to_thread(self.backend.open)
+        keys = await asyncio.to_thread(self.backend.keys)
+        self.ids = {self.key_type(k) for k in keys}
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    async def get(self, key):
+        """Return the game for key or None, loading it from the backend on a cache miss."""
+        if self.shared:
+            return await self._read_through(key)
+        if key not in self.ids:
+            return None
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        game = await asyncio.to_thread(self._read, str(key))
+        # Someone else may have loaded or removed it while we waited
+        if key in self.cache:
+            return self.cache[key]
+        if game is None or key not in self.ids:
+            return None
+
+        self._remember(key, game)
+        return game
+
+    async def _read_through(self, key):
+        # Unsaved changes of this process are newer than the database
+        if key in self.dirty or key in self.saving:
+            return self.cache.get(key)
+
+        cached = self.cache.get(key)
+        known = self.versions.get(key) if cached is not None else None
+        row = await asyncio.to_thread(self._read_versioned, str(key), known)
+        if key in self.dirty or key in self.saving:
+            return self.cache.get(key)
+        if row is None:
+            self.ids.discard(key)
+            self.cache.pop(key, None)
+            self.versions.pop(key, None)
+            return None
+
+        version, game = row
+        self.ids.add(key)
+        if game is None:
+            # Keep the object callers already hold when nothing changed elsewhere
+            cached = self.cache.get(key)
+            if cached is not None and self.versions.get(key) == version:
+                self._remember(key, cached)
+                return cached
+            # The cached copy was dropped or replaced while reading, read it again
+            return await self._read_through(key)
+
+        self.versions[key] = version
+        self._remember(key, game)
+        return game
+
+    # Readers run on worker threads, decoding can be slow (mazes are regenerated from their seed)
+    def _read(self, key):
+        text = self.backend.get(key)
+        return None if text is None else self.decode(json.loads(text))
+
+    def _read_versioned(self, key, known):
+        """(version, game) or None, game is None when the version is still the known one."""
+        row = self.backend.get_versioned(key)
+        if row is None:
+            return None
+        text, version = row
+        return version, (None if version == known else self.decode(json.loads(text)))
+
+    def put(self, key, game):
+        self.ids.add(key)
+        self._remember(key, game)
+        self.dirty[key] = game
+        self.conflicts.discard(key)
+        self._schedule_flush()
+
+    async def save(self, key, game):
+        """
+        put() for changes made to a game just read with get(). A shared store writes it
+        right away and raises GameConflict if another process saved the game first,
+        the change was dropped then and has to be redone on a fresh get().
+        """
+        self.put(key, game)
+        if not self.shared:
+            return
+        await self.flush()
+        if key in self.conflicts:
+            self.conflicts.discard(key)
+            raise GameConflict(f"{self.name} {key} was saved by another process first")
+
+    def delete(self, key):
+        self.ids.discard(key)
+        self.cache.pop(key, None)
+        self.versions.pop(key, None)
+        self.dirty[key] = None
+        self._schedule_flush()
+
+    def _remember(self, key, game):
+        self.cache[key] = game
+        self.cache.move_to_end(key)
+        if len(self.cache) <= CACHE_SIZE:
+            return
+        # Unsaved games stay cached, the backend doesn't have them yet
+        excess = len(self.cache) - CACHE_SIZE
+        evict = []
+        for old in self.cache:
+            if old not in self.dirty and old not in self.saving:
+                evict.append(old)
+                if len(evict) == excess:
+                    break
+        for old in evict:
+            del self.cache[old]
+
+    # --- Write-behind ---
+    def _schedule_flush(self, delay=None):
+        if self._flush_task is None and not self.closed:
+            self._flush_task = asyncio.create_task(self._flush_later(self.flush_delay if delay is None else delay))
+
+    async def _flush_later(self, delay):
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        """Write every dirty game to the backend in one batch."""
+        async with self._flush_lock:
+            if not self.dirty:
+                return
+            batch, self.dirty = self.dirty, {}
+            # Serialize here so the worker thread never sees a half mutated game
+            changes = {str(k): (None if g is None else json.dumps(self.encode(g))) for k, g in batch.items()}
+
+            self.saving = batch
+            try:
+                if self.shared:
+                    versions = {str(k): self.versions.get(k) for k in batch}
+                    written = await asyncio.to_thread(self.backend.write_batch, changes, versions)
+                else:
+                    written = await asyncio.to_thread(self.backend.write_batch, changes)
+            except Exception as e:
+                for key, game in batch.items():
+                    self.dirty.setdefault(key, game)
+                if self.closed:
+                    logger.error(f"Failed to save {self.name} while closing, {len(self.dirty)} changes are lost: {e}")
+                    return
+                self.failures += 1
+                delay = min(FLUSH_RETRY_MAX, max(self.flush_delay, FLUSH_RETRY_DELAY * 2 ** (self.failures - 1)))
+                logger.error(f"Failed to save {self.name}, retrying in {delay:.1f}s: {e}")
+                self._schedule_flush(delay)
+            else:
+                self.failures = 0
+                if self.shared:
+                    # Only a shared store writes with versions, the journal backend returns nothing
+                    self._record_versions(batch, written)
+            finally:
+                self.saving = {}
+
+    def _record_versions(self, batch, written):
+        for key in batch:
+            if str(key) not in written:
+                continue  # Removed
+            version = written[str(key)]
+            if version is not None:
+                self.versions[key] = version
+                continue
+            # Lost to another process, its game is the current one
+            logger.info(f"{self.name} {key} was saved by another process first, dropped this change")
+            self.conflicts.add(key)
+            self.versions.pop(key, None)
+            if key not in self.dirty:
+                self.cache.pop(key, None)
+
+    async def close(self):
+        self.closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        await asyncio.to_thread(self.backend.close)
+
+
+async def retry_on_conflict(action, attempts=CONFLICT_RETRIES):
+    """Await action() again while the game it saves conflicts with another process, the last conflict is raised."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await action()
+        except GameConflict:
+            if attempt == attempts:
+                raise
+            logger.debug(f"Game changed by another process, redoing the change (attempt {attempt + 1})")
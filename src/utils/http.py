@@ -0,0 +1,118 @@
+import time
+import random
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# ================= CONFIG =================
+TOTAL_TIMEOUT = 10            # Seconds for one attempt, connect and read included
+CONNECT_TIMEOUT = 3
+MAX_CONNECTIONS = 100         # Open connections across all hosts
+MAX_PER_HOST = 10             # Requests running against one host at a time
+DNS_CACHE_TTL = 300           # Seconds a resolved host is reused
+KEEPALIVE_TIMEOUT = 30        # Seconds an idle connection stays open
+RETRIES = 3                   # Extra attempts after a failed one
+BACKOFF_BASE = 0.5            # Seconds before the first retry, doubled every attempt
+BACKOFF_MAX = 5
+BREAKER_THRESHOLD = 5         # Failed requests in a row before a host is skipped
+BREAKER_COOLDOWN = 30         # Seconds a host is skipped before one request may try it again
+USER_AGENT = "NexusBot (discord.py)"
+# ==========================================
+
+logger = logging.getLogger("discord.bot")
+
+
+class HttpError(Exception):
+    """A request failed for good, after retries."""
+
+
+class CircuitOpen(HttpError):
+    """The host failed too often lately and is skipped without a request."""
+
+
+class HttpClient:
+    """
+    One pooled aiohttp session for every external API the bot talks to.
+    Connections are kept alive and DNS lookups cached, failed requests are
+    retried with exponential backoff and a host that keeps failing is skipped
+    for BREAKER_COOLDOWN seconds so commands answer right away instead of
+    waiting for timeouts.
+    """
+
+    def __init__(self, timeout=TOTAL_TIMEOUT, retries=RETRIES, backoff=BACKOFF_BASE,
+                 breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN):
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=CONNECT_TIMEOUT)
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.breakers = {}  # host -> [failures in a row, time the breaker opened]
+        self._session = None
+
+    @property
+    def session(self):
+        # Created on first use so it belongs to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MAX_CONNECTIONS,
+                limit_per_host=MAX_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout, headers={"User-Agent": USER_AGENT}
+            )
+        return self._session
+
+    async def get_json(self, url, **params):
+        """GET url and return the decoded JSON body, raises HttpError when it can't."""
+        host = urlsplit(url).netloc
+        self._check_breaker(host)
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.session.get(url, params=params or None) as r:
+                    if r.status < 400:
+                        data = await r.json(content_type=None)
+                        self._record(host, ok=True)
+                        return data
+                    # Client errors won't change on retry and say nothing about the host's health
+                    if r.status != 429 and r.status < 500:
+                        raise HttpError(f"GET {url} returned {r.status}")
+                    error = f"status {r.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                error = repr(e)
+
+            if attempt < self.retries:
+                delay = min(BACKOFF_MAX, self.backoff * 2 ** attempt) * random.uniform(0.5, 1)
+                logger.debug(f"GET {url} failed ({error}), retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+        self._record(host, ok=False)
+        raise HttpError(f"GET {url} failed after {self.retries + 1} attempts: {error}")
+
+    # --- Circuit breaker ---
+    def _check_breaker(self, host):
+        failures, opened = self.breakers.get(host, (0, 0.0))
+        if failures < self.breaker_threshold:
+            return
+        if time.monotonic() - opened < self.breaker_cooldown:
+            raise CircuitOpen(f"{host} is failing, skipped for now")
+        # Cooled down, let this request through as a trial and close the breaker again on success
+        self.breakers[host] = [failures, time.monotonic()]
+
+    def _record(self, host, ok):
+        if ok:
+            self.breakers.pop(host, None)
+            return
+        failures = self.breakers.get(host, (0, 0.0))[0] + 1
+        self.breakers[host] = [failures, time.monotonic()]
+        if failures == self.breaker_threshold:
+            logger.warning(f"{host} failed {failures} times in a row, skipping it for {self.breaker_cooldown}s")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
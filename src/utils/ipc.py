@@ -0,0 +1,137 @@
+import json
+import asyncio
+import logging
+import itertools
+
+# ================= CONFIG =================
+IPC_TIMEOUT = 10              # Seconds to wait for a reply
+# ==========================================
+
+logger = logging.getLogger("discord.bot")
+
+
+# Messages are JSON, one per line. A request carries an id and an op, the
+# reply carries the same id under "reply". Either side can send requests,
+# ops are answered by the handlers given to the connection.
+class IpcConnection:
+    def __init__(self, reader, writer, handlers):
+        self.reader = reader
+        self.writer = writer
+        self.handlers = handlers
+        self.pending = {}
+        self.ids = itertools.count(1)
+        self.tasks = set()
+
+    async def request(self, op, timeout=IPC_TIMEOUT, **data):
+        """Send op to the other side and return its reply."""
+        request_id = next(self.ids)
+        future = self.pending[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            await self.send({"id": request_id, "op": op, **data})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+
+    async def serve(self):
+        """Read messages until the other side disconnects."""
+        try:
+            while line := await self.reader.readline():
+                message = json.loads(line)
+                if "reply" in message:
+                    future = self.pending.get(message["reply"])
+                    if future is not None and not future.done():
+                        future.set_result(message.get("data"))
+                else:
+                    # Handlers may make requests of their own, don't block reading on them
+                    task = asyncio.create_task(self._answer(message))
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("IPC connection closed"))
+            self.close()
+
+    async def _answer(self, message):
+        request_id, op = message.pop("id"), message.pop("op")
+        handler = self.handlers.get(op)
+        try:
+            data = await handler(**message) if handler else {"error": f"unknown op {op}"}
+        except Exception as e:
+            logger.exception(f"IPC op {op} failed")
+            data = {"error": str(e)}
+        try:
+            await self.send({"reply": request_id, "data": data})
+        except ConnectionError:
+            pass
+
+    def close(self):
+        if not self.writer.is_closing():
+            self.writer.close()
+
+
+class IpcServer:
+    """
+    Runs in the launcher. Workers connect and say hello with the shared secret,
+    after that any worker can ask for an op to be broadcast to every worker.
+    """
+
+    def __init__(self, secret, handlers=None):
+        self.secret = secret
+        self.handlers = {"broadcast": self.broadcast, **(handlers or {})}
+        self.workers = {}  # cluster id -> IpcConnection
+        self.server = None
+
+    async def start(self, host, port):
+        self.server = await asyncio.start_server(self._accept, host, port)
+
+    async def _accept(self, reader, writer):
+        try:
+            hello = json.loads(await asyncio.wait_for(reader.readline(), IPC_TIMEOUT))
+        except (ValueError, asyncio.TimeoutError):
+            hello = {}
+        if hello.get("secret") != self.secret:
+            writer.close()
+            return
+
+        cluster = hello["cluster"]
+        connection = self.workers[cluster] = IpcConnection(reader, writer, self.handlers)
+        logger.info(f"Cluster {cluster} connected")
+        try:
+            await connection.serve()
+        finally:
+            if self.workers.get(cluster) is connection:
+                del self.workers[cluster]
+            logger.info(f"Cluster {cluster} disconnected")
+
+    async def broadcast(self, call, **data):
+        """Run op call on every worker, returns {cluster id: reply}."""
+        clusters = list(self.workers)
+        replies = await asyncio.gather(
+            *(self.workers[cluster].request(call, **data) for cluster in clusters), return_exceptions=True
+        )
+        return {
+            cluster: {"error": repr(reply)} if isinstance(reply, Exception) else reply
+            for cluster, reply in zip(clusters, replies)
+        }
+
+    async def close(self):
+        for connection in list(self.workers.values()):
+            connection.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+async def connect(host, port, secret, cluster, handlers):
+    """Connect a worker to the launcher, returns the connection with its read loop running."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({"secret": secret, "cluster": cluster}).encode() + b"\n")
+    await writer.drain()
+    connection = IpcConnection(reader, writer, handlers)
+    connection.serve_task = asyncio.create_task(connection.serve())
+    return connection
@@ -0,0 +1,27 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class KeyedLock:
+    """
+    One asyncio.Lock per key (e.g. a user id), so changes to the same game run in order
+    while different keys never wait on each other. A lock is dropped as soon as nobody
+    holds or waits for it.
+    """
+
+    def __init__(self):
+        self.locks = {}  # key -> [lock, holders and waiters]
+
+    @asynccontextmanager
+    async def __call__(self, key):
+        entry = self.locks.get(key)
+        if entry is None:
+            entry = self.locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.locks[key]
@@ -0,0 +1,102 @@
+import time
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger("discord.bot")
+
+
+class PrefetchBuffer:
+    """
+    Items fetched ahead of time in batches and handed out from memory.
+
+    refill is an async function returning a batch of new items. Once the
+    buffer drops below low it is topped up in the background until it holds
+    high items. Items whose key is already buffered or was handed out
+    recently are skipped, items older than ttl seconds are dropped.
+    """
+
+    def __init__(self, name, refill, low, high, ttl, key=lambda item: item["id"]):
+        self.name = name
+        self.refill = refill
+        self.low = low
+        self.high = high
+        self.ttl = ttl
+        self.key = key
+        self.items = deque()            # (fetched at, item), oldest first
+        self.keys = set()
+        self.recent = deque(maxlen=high)  # Keys handed out lately
+        self._task = None
+
+    def __len__(self):
+        self._expire()
+        return len(self.items)
+
+    def take(self, n=1, skip=None):
+        """
+        Up to n buffered items, never waits. Starts a refill when running low.
+        Items for which skip(item) is true stay buffered for someone else.
+        """
+        self._expire()
+        taken, kept = [], []
+        while self.items and len(taken) < n:
+            entry = self.items.popleft()
+            if skip is not None and skip(entry[1]):
+                kept.append(entry)
+                continue
+            key = self.key(entry[1])
+            self.keys.discard(key)
+            self.recent.append(key)
+            taken.append(entry[1])
+        self.items.extendleft(reversed(kept))
+
+        if len(self.items) < self.low:
+            self.refill_soon()
+        return taken
+
+    def add(self, items, fetched_at=None):
+        """Buffer new items, returns how many were actually new."""
+        fetched_at = fetched_at or time.monotonic()
+        added = 0
+        for item in items:
+            key = self.key(item)
+            if key in self.keys or key in self.recent or len(self.items) >= self.high:
+                continue
+            self.items.append((fetched_at, item))
+            self.keys.add(key)
+            added += 1
+        return added
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self.items and self.items[0][0] < cutoff:
+            _, item = self.items.popleft()
+            self.keys.discard(self.key(item))
+
+    # --- Refill ---
+    def refill_soon(self):
+        """Start a background refill unless one is already running."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._fill())
+        return self._task
+
+    async def fill(self):
+        """Refill now and wait for it, shares the running refill if there is one."""
+        await asyncio.shield(self.refill_soon())
+
+    async def _fill(self):
+        try:
+            while len(self) < self.high:
+                batch = await self.refill()
+                # Upstream only returned what we already have, try again next time
+                if not batch or not self.add(batch):
+                    break
+        except Exception as e:
+            logger.warning(f"Refilling {self.name} failed: {e}")
+        finally:
+            self._task = None
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,53 @@
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# ================= CONFIG =================
+RENDER_MODE = "thread"        # "thread" or "process" (process workers need picklable functions and arguments)
+RENDER_WORKERS = os.cpu_count() or 2
+MAX_PENDING_RENDERS = 32      # Renders queued or running before new ones wait
+# ==========================================
+
+logger = logging.getLogger("discord.bot")
+
+
+class RenderPool:
+    """
+    Runs image rendering and encoding off the event loop.
+    Every image producing cog submits module level render functions here so
+    a large board never blocks other commands or the gateway heartbeat.
+    """
+
+    def __init__(self, mode=RENDER_MODE, workers=RENDER_WORKERS, max_pending=MAX_PENDING_RENDERS):
+        self.mode = mode
+        self.workers = workers
+        self.slots = asyncio.Semaphore(max_pending)
+        self.stats = {}
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+        return self._executor
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool and record how long it took."""
+        async with self.slots:
+            start = time.perf_counter()
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            elapsed = time.perf_counter() - start
+
+        count, total, slowest = self.stats.get(fn.__name__, (0, 0.0, 0.0))
+        self.stats[fn.__name__] = (count + 1, total + elapsed, max(slowest, elapsed))
+        logger.debug(f"Rendered {fn.__name__} in {elapsed * 1000:.1f}ms")
+        return result
+
+
+# Shared by every cog
+render_pool = RenderPool()
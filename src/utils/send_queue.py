@@ -0,0 +1,154 @@
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+
+import discord
+
+# ================= CONFIG =================
+ROUTE_RATE = 5                # Messages sent or edited per channel...
+ROUTE_PER = 5.0               # ...every this many seconds (Discord's per-channel bucket)
+GLOBAL_RATE = 50              # Requests per second across the whole bot
+WINDOW_MARGIN = 0.25          # Seconds added to every window, Discord starts it when the request arrives
+RATE_LIMIT_RETRIES = 3        # Times a job hit by a 429 is queued again before it fails
+# ==========================================
+
+logger = logging.getLogger("discord.bot")
+
+# Lower goes first when a channel's bucket is full
+HIGH, NORMAL, LOW = 0, 1, 2  # Replies to a player / plain sends / cosmetic animation frames
+
+
+class Bucket:
+    """Rate requests per window of per seconds, the window starts with its first request like Discord's."""
+
+    def __init__(self, rate, per):
+        self.rate = rate
+        self.per = per
+        self.remaining = rate
+        self.reset_at = 0.0
+
+    def delay(self):
+        """Take a request slot and return 0, or return how long until the window resets."""
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.remaining = self.rate
+            self.reset_at = now + self.per + WINDOW_MARGIN
+        if self.remaining:
+            self.remaining -= 1
+            return 0
+        return self.reset_at - now
+
+
+class SendQueue:
+    """
+    Every cosmetic or bulk send goes through here instead of straight to REST.
+    Each channel gets its own bucket matching Discord's limits so we wait
+    client side instead of collecting 429s, higher priority messages skip the
+    line, and an edit to a message that already has one waiting replaces it
+    so only the latest content is sent.
+
+    send() and edit() return a future, await it for the message or fire and forget.
+    """
+
+    def __init__(self, route_rate=ROUTE_RATE, route_per=ROUTE_PER, global_rate=GLOBAL_RATE):
+        self.route_rate = route_rate
+        self.route_per = route_per
+        self.global_bucket = Bucket(global_rate, 1.0)
+        self.routes = {}    # channel id -> [bucket, heap of jobs, worker task]
+        self.edits = {}     # message id -> job still waiting
+        self.order = itertools.count()
+        self.stats = {"sent": 0, "edited": 0, "coalesced": 0, "rate_limited": 0, "failed": 0}
+
+    def send(self, channel, priority=NORMAL, **kwargs):
+        return self._submit(channel.id, priority, channel.send, kwargs)
+
+    def edit(self, message, priority=LOW, **kwargs):
+        job = self.edits.get(message.id)
+        if job is not None:
+            # Not sent yet, the newer content wins and both callers get the result
+            self.stats["coalesced"] += 1
+            job[3].update(kwargs)
+            if priority < job[0]:
+                job[0] = priority
+                heapq.heapify(self.routes[message.channel.id][1])
+            return job[4]
+
+        return self._submit(message.channel.id, priority, message.edit, kwargs, edit_of=message.id)
+
+    def _submit(self, route, priority, call, kwargs, edit_of=None):
+        future = asyncio.get_running_loop().create_future()
+        # Fire and forget callers never look at the result, don't warn about it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        job = [priority, next(self.order), call, kwargs, future, edit_of, 0]
+
+        entry = self.routes.get(route)
+        if entry is None:
+            entry = self.routes[route] = [Bucket(self.route_rate, self.route_per), [], None]
+        heapq.heappush(entry[1], job)
+        if edit_of is not None:
+            self.edits[edit_of] = job
+        if entry[2] is None:
+            entry[2] = asyncio.create_task(self._drain(route))
+        return future
+
+    async def _drain(self, route):
+        bucket, jobs, _ = entry = self.routes[route]
+        try:
+            while jobs:
+                # Wait for a token before picking the job, anything queued meanwhile can still overtake or coalesce
+                while delay := bucket.delay():
+                    await asyncio.sleep(delay)
+                while delay := self.global_bucket.delay():
+                    await asyncio.sleep(delay)
+
+                job = heapq.heappop(jobs)
+                _, _, call, kwargs, future, edit_of, tries = job
+                if edit_of is not None:
+                    self.edits.pop(edit_of, None)
+                if not await self._run(call, kwargs, future, edit_of, retry=tries < RATE_LIMIT_RETRIES):
+                    # Requests outside the queue (ctx.send, interactions) used up the channel, wait for a new window
+                    bucket.remaining = 0
+                    bucket.reset_at = time.monotonic() + bucket.per + WINDOW_MARGIN
+                    job[6] += 1
+                    heapq.heappush(jobs, job)
+                    if edit_of is not None and edit_of not in self.edits:
+                        self.edits[edit_of] = job
+        finally:
+            entry[2] = None
+            # Keep the bucket until its window is over, or a new burst would start from zero
+            loop = asyncio.get_running_loop()
+            loop.call_later(max(0.0, bucket.reset_at - time.monotonic()), self._forget, route, entry)
+
+    def _forget(self, route, entry):
+        if entry[2] is None and not entry[1] and self.routes.get(route) is entry:
+            del self.routes[route]
+
+    async def _run(self, call, kwargs, future, edit_of, retry=False):
+        """Run a job and settle its future, return False instead if it was rate limited and should be queued again."""
+        try:
+            result = await call(**kwargs)
+        except Exception as e:
+            if isinstance(e, discord.HTTPException) and e.status == 429:
+                self.stats["rate_limited"] += 1
+                if retry:
+                    return False
+            self.stats["failed"] += 1
+            logger.warning(f"Queued {'edit' if edit_of else 'send'} failed: {e}")
+            if not future.done():
+                future.set_exception(e)
+        else:
+            self.stats["edited" if edit_of else "sent"] += 1
+            if not future.done():
+                future.set_result(result)
+        return True
+
+    def close(self):
+        for _, jobs, task in self.routes.values():
+            if task is not None:
+                task.cancel()
+            for job in jobs:
+                job[4].cancel()
+        self.routes.clear()
+        self.edits.clear()
@@ -0,0 +1,69 @@
+import time
+import asyncio
+from collections import OrderedDict
+
+# Every cache by name, for the owner stats command
+CACHES = {}
+
+
+class TTLCache:
+    """
+    LRU cache for values fetched over the network, entries expire after ttl seconds.
+    A fetch returning None is remembered for negative_ttl seconds so unknown ids
+    don't hit the API every time, and concurrent lookups of the same key share one fetch.
+    """
+
+    def __init__(self, name, max_size, ttl, negative_ttl):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = OrderedDict()  # key -> (expires at, value)
+        self.inflight = {}            # key -> future of the running fetch
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "shared": 0, "evictions": 0}
+        CACHES[name] = self
+
+    async def get(self, key, fetch):
+        """Cached value for key, otherwise await fetch(key) and remember the result."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.stats["hits" if entry[1] is not None else "negative_hits"] += 1
+                return entry[1]
+            del self.entries[key]
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(future)
+
+        self.stats["misses"] += 1
+        future = self.inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch(key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            # Errors aren't cached, the next lookup tries again
+            future.set_exception(e)
+            future.exception()  # Nobody else may be waiting on it
+            raise
+        else:
+            future.set_result(value)
+            self.put(key, value)
+            return value
+        finally:
+            del self.inflight[key]
+
+    def put(self, key, value):
+        ttl = self.ttl if value is not None else self.negative_ttl
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, key):
+        self.entries.pop(key, None)
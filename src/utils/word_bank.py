@@ -0,0 +1,47 @@
+import os
+import random
+
+# ================= CONFIG =================
+DICTIONARY_FILE = "src/games/words.txt"  # Optional, one allowed guess per line. Without it every a-z guess is allowed
+# ==========================================
+
+
+class WordBank:
+    """
+    Answer words bucketed by length and a set of allowed guesses.
+    Everything is built once in load(), picking a word and checking a guess are O(1) after that.
+    """
+
+    def __init__(self, answers, dictionary_path=DICTIONARY_FILE):
+        self.answers = answers
+        self.dictionary_path = dictionary_path
+        self.by_length = {}
+        self.allowed = None
+
+    def load(self):
+        """Blocking, run it in a worker thread."""
+        by_length = {}
+        for word in self.answers:
+            word = word.strip().lower()
+            by_length.setdefault(len(word), []).append(word)
+        self.by_length = by_length
+
+        if self.dictionary_path and os.path.exists(self.dictionary_path):
+            with open(self.dictionary_path, "r", encoding="utf-8") as f:
+                allowed = {line.strip().lower() for line in f}
+            allowed.discard("")
+            # Answers are always valid guesses
+            for words in by_length.values():
+                allowed.update(words)
+            self.allowed = allowed
+
+    def random_word(self, length: int):
+        """A random answer of this length or None if there is none."""
+        words = self.by_length.get(length)
+        return random.choice(words) if words else None
+
+    def is_valid(self, guess: str):
+        """Plain a-z words only, then checked against the dictionary if there is one."""
+        if not (guess.isascii() and guess.isalpha()):
+            return False
+        return self.allowed is None or guess in self.allowed
@@ -0,0 +1,71 @@
+# Wordle feedback patterns.
+# A pattern holds one result per letter (ABSENT, PRESENT or CORRECT) packed
+# into a base-3 integer, position i has weight 3 ** i. Repeated letters are
+# handled like the real game: exact matches are claimed first and a letter
+# is only PRESENT while the word still has an unclaimed copy of it.
+# encode_words/score_many need numpy, which the bot itself doesn't require.
+
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+
+
+def score(guess: str, word: str) -> int:
+    """Pattern for one guess against one word of the same length."""
+    results = [ABSENT] * len(guess)
+    remaining = {}
+    for i, (g, w) in enumerate(zip(guess, word)):
+        if g == w:
+            results[i] = CORRECT
+        else:
+            remaining[w] = remaining.get(w, 0) + 1
+
+    for i, g in enumerate(guess):
+        if results[i] != CORRECT and remaining.get(g, 0) > 0:
+            results[i] = PRESENT
+            remaining[g] -= 1
+
+    return encode(results)
+
+
+def encode(results) -> int:
+    pattern = 0
+    for result in reversed(results):
+        pattern = pattern * 3 + result
+    return pattern
+
+
+def decode(pattern: int, length: int) -> list:
+    results = []
+    for _ in range(length):
+        pattern, result = divmod(pattern, 3)
+        results.append(result)
+    return results
+
+
+def encode_words(words):
+    """Turn equal length words into an (n, length) uint8 array of letter codes for score_many."""
+    import numpy as np
+    length = len(words[0])
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(-1, length) - ord("a")
+
+
+def score_many(guess: str, words):
+    """
+    Patterns of one guess against every word at once.
+    words is an array from encode_words, returns an int array with one pattern per word.
+    """
+    import numpy as np
+    length = words.shape[1]
+    g = np.frombuffer(guess.encode("ascii"), dtype=np.uint8) - ord("a")
+
+    correct = words == g
+    results = np.where(correct, CORRECT, ABSENT).astype(np.int64)
+
+    # Unclaimed copies of every letter per word, then let guess letters claim them left to right
+    letters = np.arange(26, dtype=np.uint8)
+    remaining = ((words[:, :, None] == letters) & ~correct[:, :, None]).sum(axis=1)
+    for i in range(length):
+        present = ~correct[:, i] & (remaining[:, g[i]] > 0)
+        results[present, i] = PRESENT
+        remaining[:, g[i]] -= present
+
+    return results @ (3 ** np.arange(length, dtype=np.int64))